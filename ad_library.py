@@ -0,0 +1,91 @@
+# ad_library.py
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Optional
+
+from competitor_text_index import tokenize
+
+# Messaging theme -> keywords looked up in the lowercased ad description
+THEME_KEYWORDS = {
+    'price_focused': ('price', 'cheap', 'affordable', 'discount', 'offer', 'deal'),
+    'quality_focused': ('quality', 'premium', 'best', 'top', 'excellent'),
+    'service_focused': ('service', 'support', 'help', 'consultation'),
+    'product_focused': ('product', 'design', 'modern', 'new')
+}
+# Distinct ad texts whose creative key and themes are kept for reuse across pages
+AD_TEXT_CACHE_SIZE = 4096
+_THEME_PATTERNS = {
+    theme: re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+    for theme, keywords in THEME_KEYWORDS.items()
+}
+
+
+@lru_cache(maxsize=AD_TEXT_CACHE_SIZE)
+def _themes(description: str) -> tuple:
+    return tuple(theme for theme, pattern in _THEME_PATTERNS.items() if pattern.search(description))
+
+
+def extract_themes(description: str) -> List[str]:
+    """Messaging themes of a lowercased ad description, in THEME_KEYWORDS order"""
+    return list(_themes(description))
+
+
+@lru_cache(maxsize=AD_TEXT_CACHE_SIZE)
+def creative_key(description: str) -> Optional[str]:
+    """Hash of an ad's normalized text, or None for ads without text"""
+    normalized = ' '.join(tokenize(description))
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class AdLibraryAnalyzer:
+    """
+    Per-page ad library analysis with creatives deduplicated by text.
+
+    Ads whose descriptions normalize to the same tokens (case, punctuation,
+    diacritics and spacing aside) are one creative, so a page running the same
+    creative many times counts it once. CTA and theme distributions count
+    creatives: a CTA is counted once per creative it is used with, a theme once
+    per creative it appears in. Ads without text are each their own creative.
+    The work per page is linear in its number of ads, and memory is bounded by
+    the page's creatives plus LRU caches of the most recent AD_TEXT_CACHE_SIZE
+    texts' keys and themes, which are shared across pages.
+    """
+
+    def analyze(self, active_ads: Iterable[dict]) -> Dict[str, Any]:
+        """CTA and theme distributions of one page's active ads"""
+        ad_count = 0
+        creative_ctas = {}  # creative key -> CTAs used with it, in first-seen order
+        creative_themes = {}
+        for ad in active_ads:
+            ad_count += 1
+            description = (ad.get('ad_description') or '').lower()
+            key = creative_key(description) or f"untitled-{ad_count}"
+            if key not in creative_ctas:
+                creative_ctas[key] = {}
+                creative_themes[key] = _themes(description)
+            cta = (ad.get('cta') or '').lower()
+            if cta:
+                creative_ctas[key][cta] = None
+
+        cta_counts = Counter(cta for ctas in creative_ctas.values() for cta in ctas)
+        theme_counts = Counter(theme for themes in creative_themes.values() for theme in themes)
+        return {
+            # Dicts keep first-seen order, as the old list scans did
+            'cta_types': list(dict.fromkeys(cta for ctas in creative_ctas.values() for cta in ctas)),
+            'ad_messaging_themes': list(dict.fromkeys(
+                theme for themes in creative_themes.values() for theme in themes
+            )),
+            'unique_creatives': len(creative_ctas),
+            'duplicate_creatives': ad_count - len(creative_ctas),
+            'cta_distribution': dict(cta_counts.most_common()),
+            'theme_distribution': dict(theme_counts.most_common())
+        }
+
+
+def format_distribution(distribution: Dict[str, int]) -> str:
+    """'label (count), ...' text of a distribution, most frequent first"""
+    return ', '.join(f"{label} ({count})" for label, count in distribution.items())
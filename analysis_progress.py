@@ -0,0 +1,160 @@
+# analysis_progress.py
+"""
+Progress reporting and cooperative cancellation for long analysis runs.
+
+A ProgressReporter tracks one stage at a time (pages analyzed, reports
+written, partitions rendered) and sends progress events to its sinks. A sink
+is any callable taking the event dict; TerminalProgressBar and LogProgressSink
+cover the common cases. Work loops call advance() at chunk boundaries, which
+is also where a cancelled CancellationToken stops the run by raising
+AnalysisCancelled, so files already written are always complete.
+
+Event keys: stage, unit, done, total, elapsed, rate (units per second),
+eta (seconds, None when unknown), message and status ('running', 'finished'
+or 'cancelled').
+"""
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterable
+
+DEFAULT_CHUNK_SIZE = 256  # pages between progress updates and cancellation checks
+POLL_INTERVAL = 0.25  # seconds between cancellation checks while waiting on worker processes
+
+
+class AnalysisCancelled(Exception):
+    """Raised at a chunk boundary once the run's CancellationToken is cancelled"""
+
+
+class CancellationToken:
+    """Thread-safe flag a caller sets to stop a run at its next chunk boundary"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class TerminalProgressBar:
+    """Sink drawing a single-line progress bar, one line per stage"""
+
+    def __init__(self, stream=None, width: int = 30):
+        self.stream = stream or sys.stderr
+        self.width = width
+
+    def __call__(self, event: Dict[str, Any]):
+        total = event['total']
+        if total:
+            filled = int(self.width * min(event['done'] / total, 1))
+            bar = f"[{'#' * filled}{'.' * (self.width - filled)}] {event['done']}/{total}"
+        else:
+            bar = str(event['done'])
+        eta = f" ETA {_format_seconds(event['eta'])}" if event['eta'] is not None else ''
+        message = f" {event['message']}" if event['message'] else ''
+        line = f"\r{event['stage']:<14} {bar} {event['unit']} {event['rate']:.1f}/s{eta}{message}"
+        self.stream.write(f"{line:<100}")
+        if event['status'] != 'running':
+            self.stream.write(f" {event['status']}\n" if event['status'] == 'cancelled' else "\n")
+        self.stream.flush()
+
+
+class LogProgressSink:
+    """Sink writing one log line per progress event"""
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger('competitor_analysis.progress')
+        self.level = level
+
+    def __call__(self, event: Dict[str, Any]):
+        self.logger.log(
+            self.level, "%s %s: %s/%s %s (%.1f/s, ETA %s)%s",
+            event['stage'], event['status'], event['done'], event['total'] or '?', event['unit'],
+            event['rate'], _format_seconds(event['eta']) if event['eta'] is not None else '?',
+            f" - {event['message']}" if event['message'] else ''
+        )
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s" if minutes else f"{seconds}s"
+
+
+class ProgressReporter:
+    """
+    Tracks the current stage of a run and fans progress events out to sinks.
+
+    Events are throttled to one per min_interval seconds while a stage runs;
+    stage start, finish and message changes are always sent. A reporter
+    without sinks or token is a cheap no-op, so it is safe as a default.
+    """
+
+    def __init__(self, sinks: Iterable[Callable[[Dict[str, Any]], None]] = (),
+                 cancel_token: CancellationToken = None, min_interval: float = 0.5):
+        self.sinks = list(sinks)
+        self.cancel_token = cancel_token
+        self.min_interval = min_interval
+        self._stage = None
+
+    def checkpoint(self):
+        """Raise AnalysisCancelled if the run has been cancelled"""
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            raise AnalysisCancelled(f"Cancelled during {self._stage['name'] if self._stage else 'analysis'}")
+
+    @contextmanager
+    def stage(self, name: str, total: int = None, unit: str = 'items'):
+        """Context for one stage; reports its start, its finish or its cancellation"""
+        self._stage = {'name': name, 'total': total, 'unit': unit, 'done': 0, 'message': None,
+                       'started': time.monotonic(), 'last_emit': 0.0}
+        self._emit('running')
+        try:
+            yield self
+        except AnalysisCancelled:
+            self._emit('cancelled')
+            raise
+        else:
+            self._emit('finished')
+        finally:
+            self._stage = None
+
+    def advance(self, count: int = 1, message: str = None):
+        """Record completed units (and optionally what is running now), then check for cancellation"""
+        if self._stage is not None:
+            stage = self._stage
+            stage['done'] += count
+            message_changed = message is not None and message != stage['message']
+            if message is not None:
+                stage['message'] = message
+            if message_changed or time.monotonic() - stage['last_emit'] >= self.min_interval:
+                self._emit('running')
+        self.checkpoint()
+
+    def _emit(self, status: str):
+        stage = self._stage
+        now = time.monotonic()
+        stage['last_emit'] = now
+        if not self.sinks:
+            return
+        elapsed = now - stage['started']
+        rate = stage['done'] / elapsed if elapsed > 0 else 0.0
+        remaining = stage['total'] - stage['done'] if stage['total'] is not None else None
+        event = {
+            'stage': stage['name'],
+            'unit': stage['unit'],
+            'done': stage['done'],
+            'total': stage['total'],
+            'elapsed': round(elapsed, 3),
+            'rate': rate,
+            'eta': 0.0 if status == 'finished' else (remaining / rate if remaining is not None and rate > 0 else None),
+            'message': stage['message'],
+            'status': status
+        }
+        for sink in self.sinks:
+            sink(event)
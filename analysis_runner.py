@@ -2,6 +2,9 @@
 import json
 from competitor_analyser import FacebookCompetitorAnalyzer
 from competitor_analysis_reporter import CompetitorReportGenerator
+from competitor_aggregator import CompetitorAggregate, WEAK_ENGAGEMENT_LEVELS
+from compressed_io import load_json
+from analysis_progress import ProgressReporter, TerminalProgressBar, AnalysisCancelled
 import os
 from datetime import datetime
 import readline
@@ -16,9 +19,9 @@ def get_fb_competitors_json():
             continue
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                facebook_data = json.load(f)
-                print("✅ File loaded successfully.")
+            # gzip, bz2 and xz dumps are decompressed on the fly
+            facebook_data = load_json(path)
+            print("✅ File loaded successfully.")
         except json.JSONDecodeError:
             print("❌ File is not valid JSON. Please provide a valid JSON file.")
             facebook_data = None
@@ -46,7 +49,7 @@ def get_fb_competitors_json():
 #     return results
 
 # Additional utility function to extract specific insights
-def extract_actionable_insights(analysis_results):
+def extract_actionable_insights(analysis_results, aggregate=None):
     """Extract specific actionable insights for strategic planning"""
     
     insights = {
@@ -58,7 +61,8 @@ def extract_actionable_insights(analysis_results):
     }
     
     competitors = analysis_results['competitors']
-    market_position = analysis_results['market_position_analysis']
+    if aggregate is None:
+        aggregate = CompetitorAggregate.from_competitors(competitors, analysis_results['market_position_analysis'])
     
     # Immediate opportunities
     for competitor in competitors:
@@ -75,7 +79,7 @@ def extract_actionable_insights(analysis_results):
             })
         
         # Poor engagement quality = opportunity
-        if engagement['follower_engagement_quality'] in ['poor', 'very_poor_or_fake_followers']:
+        if engagement['follower_engagement_quality'] in WEAK_ENGAGEMENT_LEVELS:
             insights["immediate_opportunities"].append({
                 "type": "engagement_weakness",
                 "competitor": name,
@@ -83,45 +87,31 @@ def extract_actionable_insights(analysis_results):
             })
     
     # Content strategy recommendations
-    view_performances = [(comp['page_name'], comp['engagement_metrics']['reel_views']['average_views']) 
-                        for comp in competitors]
-    best_performer = max(view_performances, key=lambda x: x[1])
-    
-    insights["content_strategy_recommendations"].append({
-        "benchmark": f"{best_performer[0]} averages {best_performer[1]:,.0f} views per reel",
-        "recommendation": "Analyze their top-performing content themes and formats",
-        "potential_impact": "Could increase content performance by 2-5x based on gap analysis"
-    })
+    best_performer = aggregate.views_leader
+    if best_performer:
+        insights["content_strategy_recommendations"].append({
+            "benchmark": f"{best_performer[0]} averages {best_performer[1]:,.0f} views per reel",
+            "recommendation": "Analyze their top-performing content themes and formats",
+            "potential_impact": "Could increase content performance by 2-5x based on gap analysis"
+        })
     
     # Market gaps
-    locations = set()
-    categories = set()
-    for comp in competitors:
-        business = comp['business_analysis']
-        if business['location'] != 'not_specified':
-            locations.add(business['location'])
-        if business['categories'] != 'not_specified':
-            categories.add(business['categories'])
-    
-    if len(locations) == 1:
+    if len(aggregate.locations) == 1:
         insights["market_gaps"].append({
             "type": "geographic_concentration",
-            "gap": f"All competitors focus on {list(locations)[0]}",
+            "gap": f"All competitors focus on {next(iter(aggregate.locations))}",
             "opportunity": "Geographic expansion to other cities/areas"
         })
     
     # Competitive advantages to exploit
-    advertising_competitors = [comp for comp in competitors if comp['advertising_analysis']['is_advertising']]
-    if len(advertising_competitors) == 1:
+    if aggregate.advertising_count == 1:
         insights["competitive_advantages"].append({
             "advantage": "Low advertising competition",
-            "detail": f"Only {advertising_competitors[0]['page_name']} is actively advertising",
+            "detail": f"Only {aggregate.first_advertiser} is actively advertising",
             "action": "Enter advertising market with aggressive campaigns"
         })
     
-    cross_platform_adoption = [comp['business_analysis']['cross_platform_presence']['total_platforms'] 
-                              for comp in competitors]
-    avg_platforms = sum(cross_platform_adoption) / len(cross_platform_adoption)
+    avg_platforms = aggregate.average_platforms
     
     if avg_platforms < 2:
         insights["competitive_advantages"].append({
@@ -132,67 +122,85 @@ def extract_actionable_insights(analysis_results):
     
     return insights
 
-# Enhanced analysis runner with actionable insights
-def run_comprehensive_analysis():
-    """Run the complete analysis with actionable insights"""
-    
-    print("🚀 Starting Comprehensive Facebook Competitor Analysis...\n")
-    
-    # Run basic analysis
-    facebook_data = get_fb_competitors_json()
-    analyzer = FacebookCompetitorAnalyzer(data_dict=facebook_data)
-    results = analyzer.analyze_all_competitors()
+def build_comprehensive_results(facebook_data, lean_results=False, progress=None):
+    """Analyze a scrape dump and combine the results with actionable insights and an executive summary"""
+    analyzer = FacebookCompetitorAnalyzer(data_dict=facebook_data, lean_results=lean_results)
+    results = analyzer.analyze_all_competitors(progress)
 
     # Extract actionable insights
-    actionable_insights = extract_actionable_insights(results)
-    
+    aggregate = analyzer.market_aggregate
+    actionable_insights = extract_actionable_insights(results, aggregate)
     
-    # Need testig
     # Combine all results
-    comprehensive_results = {
+    return {
         **results,
         "actionable_insights": actionable_insights,
-        "executive_summary": generate_executive_summary(results, actionable_insights)
+        "executive_summary": generate_executive_summary(results, actionable_insights, aggregate)
     }
 
-    # Generate reports
-    output_folder = "output"
-    current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+# Enhanced analysis runner with actionable insights
+def run_comprehensive_analysis(lean_results=False, partition_by=None, progress=None):
+    """
+    Run the complete analysis with actionable insights.
+    
+    lean_results keeps raw extraction_data out of the results and reports.
+    partition_by additionally writes one report set per segment (see
+    CompetitorReportGenerator.generate_partitioned_reports).
+    progress is a ProgressReporter (a terminal progress bar by default); if
+    its cancellation token is cancelled the run stops at the next chunk
+    boundary and returns None, keeping any reports already written.
+    """
+    
+    print("🚀 Starting Comprehensive Facebook Competitor Analysis...\n")
+    progress = progress or ProgressReporter([TerminalProgressBar()])
+    
+    # Run basic analysis
+    facebook_data = get_fb_competitors_json()
+    try:
+        comprehensive_results = build_comprehensive_results(facebook_data, lean_results, progress)
 
-    os.makedirs(output_folder, exist_ok=True)
-    generator = CompetitorReportGenerator(comprehensive_results)
-    generator.generate_all_reports(f"{output_folder}/competitor_analysis_{current_timestamp}")
+        # Generate reports
+        output_folder = "output"
+        current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        os.makedirs(output_folder, exist_ok=True)
+        generator = CompetitorReportGenerator(comprehensive_results, cache_dir=os.path.join(output_folder, ".report_cache"))
+        generator.generate_all_reports(f"{output_folder}/competitor_analysis_{current_timestamp}", progress=progress)
+        if partition_by:
+            generator.generate_partitioned_reports(
+                partition_by, os.path.join(output_folder, f"competitor_partitions_{current_timestamp}"),
+                progress=progress
+            )
+    except AnalysisCancelled as e:
+        print(f"⏹️ {e}; reports already written are complete.")
+        return None
     
     return comprehensive_results
 
-def generate_executive_summary(results, insights):
+def generate_executive_summary(results, insights, aggregate=None):
     """Generate executive summary for leadership"""
     
-    competitors = results['competitors']
     summary_stats = results['summary_statistics']
+    if aggregate is None:
+        aggregate = CompetitorAggregate.from_competitors(results['competitors'], results['market_position_analysis'])
     
     # Find market leader
-    market_leader = max(competitors, key=lambda x: x['engagement_metrics']['followers'])
+    market_leader, leader_followers = aggregate.follower_leader or (None, 0)
     
     # Calculate total market size
-    total_followers = sum(comp['engagement_metrics']['followers'] for comp in competitors)
-    
-    # Count opportunities
-    ad_gaps = len([comp for comp in competitors if not comp['advertising_analysis']['is_advertising']])
+    total_followers = aggregate.total_followers
     
     summary = {
         "market_overview": {
             "total_market_size": f"{total_followers:,} combined followers",
-            "market_leader": market_leader['page_name'],
-            "leader_market_share": f"{(market_leader['engagement_metrics']['followers'] / total_followers * 100):.1f}%",
+            "market_leader": market_leader,
+            "leader_market_share": f"{(leader_followers / total_followers * 100 if total_followers else 0):.1f}%",
             "average_engagement_quality": summary_stats['average_content_performance']
         },
         "key_opportunities": {
-            "advertising_gaps": f"{ad_gaps} out of {len(competitors)} competitors not advertising",
-            "engagement_weakness": len([comp for comp in competitors 
-                                      if comp['engagement_metrics']['follower_engagement_quality'] in ['poor', 'very_poor_or_fake_followers']]),
-            "cross_platform_gaps": len([comp for comp in competitors 
-                                       if comp['business_analysis']['cross_platform_presence']['total_platforms'] < 2])
+            "advertising_gaps": f"{aggregate.advertising_gap_count} out of {aggregate.count} competitors not advertising",
+            "engagement_weakness": aggregate.weak_engagement_count,
+            "cross_platform_gaps": aggregate.cross_platform_gap_count
         },
         "strategic_recommendations": [
             "Enter paid advertising market immediately - low competition",
@@ -0,0 +1,294 @@
+# analysis_service.py
+"""
+Local HTTP service that keeps competitor analysis results hot in memory.
+
+    GET  /competitors?q=<query>&offset=&limit=     competitor lookup (text index query, optional)
+    GET  /competitors/<position>                   one full competitor record
+    GET  /leaderboard?by=competitiveness|followers|engagement&offset=&limit=
+    GET  /segments?by=category|location|maturity|ad_intensity|engagement&offset=&limit=
+    GET  /reports/<excel|word|json>?q=<query>      rendered report download
+    POST /reload                                   reload the dump (optional JSON body {"path": ...})
+
+Queries use the CompetitorTextIndex syntax. Rendered reports are kept in an
+LRU cache keyed by reload generation, format and query, which is cleared on reload.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any
+from urllib.parse import urlparse, parse_qs
+
+from analysis_runner import build_comprehensive_results
+from competitor_analysis_reporter import CompetitorReportGenerator, OVERVIEW_COLUMNS
+from competitor_text_index import CompetitorTextIndex
+from compressed_io import load_json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+REPORT_FORMATS = {
+    'excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'word': ('docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+    'json': ('json', 'application/json')
+}
+LEADERBOARDS = {
+    'competitiveness': ('overall_competitiveness', False),
+    'followers': ('follower_rank', True),
+    'engagement': ('engagement_rank', True)
+}
+SEGMENTS = {
+    'category': 'categories',
+    'location': 'location',
+    'maturity': 'business_maturity',
+    'ad_intensity': 'ad_intensity',
+    'engagement': 'engagement_quality'
+}
+
+
+class NotFound(LookupError):
+    """A requested competitor or query result does not exist; served as 404"""
+
+
+class ReportCache:
+    """Thread-safe LRU cache of rendered report bytes"""
+
+    def __init__(self, capacity: int = 16):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class AnalysisState:
+    """One loaded dump with its analysis results, text index and flattened tables"""
+
+    def __init__(self, dump_path: str, lean_results: bool = False, generation: int = 0):
+        self.data = load_json(dump_path)
+        self.dump_path = dump_path
+        # Reload count of the service when this state was loaded; part of report cache keys
+        self.generation = generation
+        self.lean_results = lean_results
+        try:
+            self.results = build_comprehensive_results(self.data, lean_results)
+            self.text_index = CompetitorTextIndex(self.data)
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
+            raise ValueError(f"{dump_path} is not a valid scrape dump: {type(e).__name__}: {e}") from e
+        self.generator = CompetitorReportGenerator(self.results)
+        self.frame = self.generator.competitor_frame()
+
+    def positions(self, query: str = None) -> List[int]:
+        if not query:
+            return list(range(len(self.frame)))
+        return self.text_index.query_positions(query)
+
+    def render_report(self, report_format: str, query: str = None) -> bytes:
+        """Render one report for the whole market or a query's result set"""
+        if query:
+            results = build_comprehensive_results(self.text_index.select_pages(query), self.lean_results)
+            if not results['competitors']:
+                raise NotFound(f"No competitors match '{query}'")
+            generator = CompetitorReportGenerator(results)
+        else:
+            generator = self.generator
+
+        extension, _ = REPORT_FORMATS[report_format]
+        output_dir = tempfile.mkdtemp(prefix="competitor_report_")
+        try:
+            filename = os.path.join(output_dir, f"competitor_analysis.{extension}")
+            {
+                'excel': generator.create_excel_report,
+                'word': generator.create_word_report,
+                'json': generator.create_json_report
+            }[report_format](filename)
+            with open(filename, 'rb') as f:
+                return f.read()
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def _paginate(rows, params: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Slice a DataFrame to the requested page before converting it to records"""
+    offset = max(int(params.get('offset', ['0'])[0]), 0)
+    limit = min(max(int(params.get('limit', [str(DEFAULT_PAGE_SIZE)])[0]), 1), MAX_PAGE_SIZE)
+    items = rows.iloc[offset:offset + limit].to_dict('records')
+    return {'total': len(rows), 'offset': offset, 'limit': limit, 'items': items}
+
+
+def _choice(params: Dict[str, List[str]], name: str, choices: Dict[str, Any], default: str) -> str:
+    value = params.get(name, [default])[0]
+    if value not in choices:
+        raise ValueError(f"{name} must be one of: {', '.join(choices)}")
+    return value
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests against the AnalysisService attached to the server"""
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json', headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload, status: int = 200):
+        self._send(status, json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        service = self.server.service
+        state = service.state
+        try:
+            if parts == ['competitors']:
+                frame = state.frame.iloc[state.positions(params.get('q', [None])[0])]
+                rows = frame[list(OVERVIEW_COLUMNS)].rename(columns=OVERVIEW_COLUMNS)
+                rows.insert(0, 'Position', frame.index)
+                self._send_json(_paginate(rows, params))
+            elif len(parts) == 2 and parts[0] == 'competitors':
+                position = int(parts[1])
+                if not 0 <= position < len(state.results['competitors']):
+                    raise NotFound(f"No competitor at position {position}")
+                competitor = state.results['competitors'][position]
+                self._send_json({
+                    'position': position,
+                    'competitor': competitor,
+                    'market_position': state.results['market_position_analysis'].get(competitor['page_name'])
+                })
+            elif parts == ['leaderboard']:
+                column, ascending = LEADERBOARDS[_choice(params, 'by', LEADERBOARDS, 'competitiveness')]
+                board = state.frame.sort_values(column, ascending=ascending, kind='stable')
+                rows = board[['page_name', 'followers', 'average_views', 'estimated_market_share',
+                              'follower_rank', 'engagement_rank', 'overall_competitiveness']]
+                rows.insert(0, 'position', board.index)
+                self._send_json(_paginate(rows, params))
+            elif parts == ['segments']:
+                column = SEGMENTS[_choice(params, 'by', SEGMENTS, 'category')]
+                summary = state.frame.groupby(column, sort=False, observed=True).agg(
+                    competitors=('page_name', 'size'),
+                    total_followers=('followers', 'sum'),
+                    average_followers=('followers', 'mean'),
+                    average_competitiveness=('overall_competitiveness', 'mean'),
+                    advertising_rate=('is_advertising', 'mean')
+                ).sort_values('competitors', ascending=False, kind='stable').round(2)
+                summary['advertising_rate'] = (summary['advertising_rate'] * 100).round(2)
+                self._send_json(_paginate(summary.reset_index().rename(columns={column: 'segment'}), params))
+            elif len(parts) == 2 and parts[0] == 'reports' and parts[1] in REPORT_FORMATS:
+                query = params.get('q', [None])[0]
+                extension, content_type = REPORT_FORMATS[parts[1]]
+                body = service.report(parts[1], query)
+                self._send(200, body, content_type, {
+                    'Content-Disposition': f'attachment; filename="competitor_analysis.{extension}"'
+                })
+            else:
+                self._send_json({'error': f"Unknown endpoint: {url.path}"}, 404)
+        except NotFound as e:
+            self._send_json({'error': str(e)}, 404)
+        except ValueError as e:
+            self._send_json({'error': str(e)}, 400)
+        except Exception:
+            self._send_internal_error()
+
+    def _send_internal_error(self):
+        self.log_error("Unhandled error for %s %s\n%s", self.command, self.path, traceback.format_exc())
+        self._send_json({'error': "Internal server error"}, 500)
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/reload':
+            self._send_json({'error': f"Unknown endpoint: {self.path}"}, 404)
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(body, dict) or not isinstance(body.get('path', ''), str):
+                raise ValueError('Request body must be a JSON object such as {"path": "dump.json"}')
+            # A dump that fails to load or analyze leaves the current state in place
+            state = self.server.service.reload(body.get('path'))
+        except (OSError, ValueError) as e:
+            self._send_json({'error': str(e)}, 400)
+            return
+        except Exception:
+            self._send_internal_error()
+            return
+        self._send_json({'reloaded': state.dump_path, 'total_competitors': len(state.results['competitors'])})
+
+
+class AnalysisService:
+    """Holds the current AnalysisState and report cache behind an HTTP server"""
+
+    def __init__(self, dump_path: str, lean_results: bool = False, report_cache_size: int = 16):
+        self.lean_results = lean_results
+        self.state = AnalysisState(dump_path, lean_results)
+        self.reports = ReportCache(report_cache_size)
+        self._reload_lock = threading.Lock()
+
+    def report(self, report_format: str, query: str = None) -> bytes:
+        state = self.state
+        key = (state.generation, report_format, query or '')
+        body = self.reports.get(key)
+        if body is None:
+            body = state.render_report(report_format, query)
+            # A render that outlived a reload is still served, but not cached
+            if state is self.state:
+                self.reports.put(key, body)
+        return body
+
+    def reload(self, dump_path: str = None) -> AnalysisState:
+        """Load a new dump, then swap it in; requests keep using the old state until then"""
+        with self._reload_lock:
+            state = AnalysisState(dump_path or self.state.dump_path, self.lean_results, self.state.generation + 1)
+            self.state = state
+            self.reports.clear()
+            return state
+
+    def serve(self, host: str = '127.0.0.1', port: int = 8765):
+        server = ThreadingHTTPServer((host, port), AnalysisRequestHandler)
+        server.service = self
+        print(f"📡 Serving {len(self.state.results['competitors'])} competitors on http://{host}:{port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve competitor analysis results over local HTTP")
+    parser.add_argument('dump_path')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--lean', action='store_true', help="Keep raw extraction_data out of the results")
+    parser.add_argument('--report-cache-size', type=int, default=16)
+    args = parser.parse_args()
+
+    AnalysisService(args.dump_path, args.lean, args.report_cache_size).serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
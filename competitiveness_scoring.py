@@ -0,0 +1,157 @@
+# competitiveness_scoring.py
+from itertools import product
+from typing import Dict, List, Any, Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+from competitor_analyser import COMPETITIVENESS_WEIGHTS, FOLLOWER_SCORE_CAP, GROWTH_SCORE_CAP, BUSINESS_MATURITY_SCORES
+
+SCORE_COMPONENTS = ('followers', 'engagement', 'business', 'advertising', 'growth')
+
+
+def descending_ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    Competition ranks (1 = best, ties share the best rank) along the last axis.
+
+    Matches sorted(scores, reverse=True).index(score) + 1 for every row at once.
+    """
+    scores = np.atleast_2d(scores)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    sorted_scores = np.take_along_axis(scores, order, axis=1)
+
+    positions = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    starts_group = np.ones(scores.shape, dtype=bool)
+    starts_group[:, 1:] = sorted_scores[:, 1:] != sorted_scores[:, :-1]
+    group_start = np.maximum.accumulate(np.where(starts_group, positions, 0), axis=1)
+
+    ranks = np.empty(scores.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, group_start + 1, axis=1)
+    return ranks
+
+
+def round_like_python(values: np.ndarray, digits: int = 2) -> np.ndarray:
+    """
+    np.round that agrees with Python's round() on every element.
+
+    The two only disagree on values that sit on a rounding half-way point after
+    scaling; those few elements are re-rounded with round() itself.
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10 ** digits
+    halfway = np.isclose(np.abs(scaled - np.floor(scaled)), 0.5, rtol=0, atol=1e-6)
+    if halfway.any():
+        rounded[halfway] = [round(value, digits) for value in values[halfway].tolist()]
+    return rounded
+
+
+def weight_grid(step: float = 0.1) -> np.ndarray:
+    """All weight configurations on a grid of the given step whose components sum to 1"""
+    units = int(round(1 / step))
+    rows = [combo for combo in product(range(units + 1), repeat=len(SCORE_COMPONENTS) - 1) if sum(combo) <= units]
+    grid = np.array([combo + (units - sum(combo),) for combo in rows], dtype=float)
+    return grid / units
+
+
+class CompetitivenessScoringEngine:
+    """
+    What-if engine for calculate_competitiveness_score.
+
+    Component scores (0-100) are extracted once from the analysis results; a
+    whole matrix of weight configurations is then scored and ranked with
+    broadcast array operations instead of re-running the analysis per weight set.
+    """
+
+    def __init__(self, analysis_results: dict):
+        competitors = analysis_results['competitors']
+        self.page_names = [comp['page_name'] for comp in competitors]
+
+        self.followers = np.array([comp['engagement_metrics']['followers'] for comp in competitors], dtype=float)
+        content = np.array([comp['engagement_metrics']['content_performance_score'] for comp in competitors], dtype=float)
+        business = np.array([
+            BUSINESS_MATURITY_SCORES.get(comp['business_analysis']['business_maturity'], 0) for comp in competitors
+        ], dtype=float)
+        advertising = np.array([comp['advertising_analysis']['is_advertising'] for comp in competitors], dtype=float)
+        growth = np.array([
+            comp.get('growth_metrics', {}).get('followers_per_day', 0) for comp in competitors
+        ], dtype=float)
+
+        # Component matrix without the follower column, which depends on the cap
+        self.fixed_components = np.column_stack([
+            np.minimum(content, 100), business, advertising * 100, np.minimum(growth / GROWTH_SCORE_CAP * 100, 100)
+        ]) if competitors else np.zeros((0, len(SCORE_COMPONENTS) - 1))
+
+    def _weight_matrix(self, weights: Union[np.ndarray, Iterable[Dict[str, float]]]) -> np.ndarray:
+        if isinstance(weights, np.ndarray):
+            matrix = np.atleast_2d(weights).astype(float)
+        else:
+            matrix = np.array([[config.get(name, 0.0) for name in SCORE_COMPONENTS] for config in weights], dtype=float)
+        if matrix.shape[1] != len(SCORE_COMPONENTS):
+            raise ValueError(f"Weight configurations need {len(SCORE_COMPONENTS)} columns: {SCORE_COMPONENTS}")
+        return matrix
+
+    def score(self, weights: Union[np.ndarray, Iterable[Dict[str, float]]], follower_caps=None) -> np.ndarray:
+        """
+        Competitiveness scores for each weight configuration.
+
+        weights is an (m, 5) array in SCORE_COMPONENTS order or a list of dicts
+        keyed by component (missing components weigh 0); follower_caps is a scalar or one cap per configuration.
+        Returns an (m, n_competitors) array rounded like the analyzer's scores.
+        """
+        matrix = self._weight_matrix(weights)
+        caps = np.broadcast_to(
+            np.asarray(FOLLOWER_SCORE_CAP if follower_caps is None else follower_caps, dtype=float),
+            (matrix.shape[0],)
+        )
+        follower_scores = np.minimum(self.followers[np.newaxis, :] / caps[:, np.newaxis] * 100, 100)
+        # Summed component by component in the analyzer's order so the baseline matches it exactly
+        scores = matrix[:, :1] * follower_scores
+        for i in range(self.fixed_components.shape[1]):
+            scores = scores + matrix[:, i + 1:i + 2] * self.fixed_components[:, i]
+        return round_like_python(scores)
+
+    def baseline_scores(self) -> np.ndarray:
+        """Scores under the analyzer's current weights"""
+        return self.score([COMPETITIVENESS_WEIGHTS])[0]
+
+    def rank(self, weights: Union[np.ndarray, Iterable[Dict[str, float]]], follower_caps=None) -> np.ndarray:
+        """Competitiveness ranks, one row per weight configuration"""
+        return descending_ranks(self.score(weights, follower_caps))
+
+    def sensitivity(self, weights: Union[np.ndarray, Iterable[Dict[str, float]]], follower_caps=None,
+                    stable_within: int = 0) -> pd.DataFrame:
+        """
+        How each competitor's rank moves across the weight configurations.
+
+        A competitor is stable when its rank never moves more than stable_within
+        places away from its rank under the current weights.
+        """
+        ranks = self.rank(weights, follower_caps)
+        baseline = descending_ranks(self.baseline_scores())[0]
+        max_shift = np.abs(ranks - baseline).max(axis=0) if len(ranks) else np.zeros_like(baseline)
+
+        sensitivity = pd.DataFrame({
+            'Competitor': self.page_names,
+            'Baseline_Rank': baseline,
+            'Best_Rank': ranks.min(axis=0),
+            'Worst_Rank': ranks.max(axis=0),
+            'Mean_Rank': ranks.mean(axis=0).round(2),
+            'Rank_Std': ranks.std(axis=0).round(2),
+            'Max_Rank_Shift': max_shift,
+            'Is_Stable': max_shift <= stable_within
+        })
+        return sensitivity.sort_values(['Baseline_Rank', 'Max_Rank_Shift']).reset_index(drop=True)
+
+    def sweep(self, weights: Union[np.ndarray, Iterable[Dict[str, float]]], follower_caps=None) -> List[Dict[str, Any]]:
+        """Per-configuration summary: the weights used and the resulting leader"""
+        matrix = self._weight_matrix(weights)
+        scores = self.score(matrix, follower_caps)
+        summary = []
+        for row, config_scores in zip(matrix, scores):
+            leader = int(config_scores.argmax()) if len(config_scores) else None
+            summary.append({
+                'weights': dict(zip(SCORE_COMPONENTS, row.tolist())),
+                'leader': self.page_names[leader] if leader is not None else None,
+                'leader_score': float(config_scores[leader]) if leader is not None else 0
+            })
+        return summary
@@ -0,0 +1,233 @@
+# competitor_aggregator.py
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Optional
+
+WEAK_ENGAGEMENT_LEVELS = ('poor', 'very_poor_or_fake_followers')
+
+
+class CompetitorAggregate:
+    """
+    Single-pass accumulator of market-wide competitor statistics.
+
+    Every statistic needed by the summary stats, competitive insights,
+    actionable insights and executive summary is collected by add() in one
+    walk over the competitors. Aggregates built over separate chunks can be
+    combined with merge(), so the same code serves in-memory, parallel and
+    streaming runs. Leaders keep the earliest competitor on ties, matching
+    max() over the full list when chunks are merged in order.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_followers = 0
+        self.total_content_performance = 0.0
+        self.total_platforms = 0
+        self.advertising_count = 0
+        self.first_advertiser = None
+        self.weak_engagement_count = 0
+        self.cross_platform_gap_count = 0
+        # Leaders are stored as [page_name, value]
+        self.follower_leader = None
+        self.views_leader = None
+        self.competitiveness_leader = None
+        self.locations = set()
+        self.categories = set()
+        # Ad library distributions, counted over each page's deduplicated creatives
+        self.unique_creatives = 0
+        self.duplicate_creatives = 0
+        self.cta_counts = Counter()
+        self.theme_counts = Counter()
+
+    @classmethod
+    def from_competitors(cls, competitors: Iterable[dict], market_position: dict = None) -> 'CompetitorAggregate':
+        """Build an aggregate from competitor records, taking competitiveness from market_position if given"""
+        aggregate = cls()
+        market_position = market_position or {}
+        for competitor in competitors:
+            position = market_position.get(competitor['page_name'], {})
+            aggregate.add(competitor, position.get('overall_competitiveness'))
+        return aggregate
+
+    @classmethod
+    def combine(cls, aggregates: Iterable['CompetitorAggregate']) -> 'CompetitorAggregate':
+        """Merge chunk aggregates in order into a new aggregate"""
+        combined = cls()
+        for aggregate in aggregates:
+            combined.merge(aggregate)
+        return combined
+
+    @staticmethod
+    def _update_leader(current: Optional[list], name: str, value) -> list:
+        if current is None or value > current[1]:
+            return [name, value]
+        return current
+
+    def add(self, competitor: dict, competitiveness: float = None) -> 'CompetitorAggregate':
+        """Fold one analyzed competitor into the aggregate"""
+        name = competitor['page_name']
+        metrics = competitor['engagement_metrics']
+        business = competitor['business_analysis']
+        advertising = competitor['advertising_analysis']
+        is_advertising = advertising['is_advertising']
+        platforms = business['cross_platform_presence']['total_platforms']
+
+        self.count += 1
+        self.total_followers += metrics['followers']
+        self.total_content_performance += metrics['content_performance_score']
+        self.total_platforms += platforms
+
+        if is_advertising:
+            if self.advertising_count == 0:
+                self.first_advertiser = name
+            self.advertising_count += 1
+        if metrics['follower_engagement_quality'] in WEAK_ENGAGEMENT_LEVELS:
+            self.weak_engagement_count += 1
+        if platforms < 2:
+            self.cross_platform_gap_count += 1
+
+        self.follower_leader = self._update_leader(self.follower_leader, name, metrics['followers'])
+        self.views_leader = self._update_leader(self.views_leader, name, metrics['reel_views']['average_views'])
+        if competitiveness is not None:
+            self.competitiveness_leader = self._update_leader(self.competitiveness_leader, name, competitiveness)
+
+        if business['location'] != 'not_specified':
+            self.locations.add(business['location'])
+        if business['categories'] != 'not_specified':
+            self.categories.add(business['categories'])
+
+        self.unique_creatives += advertising.get('unique_creatives', 0)
+        self.duplicate_creatives += advertising.get('duplicate_creatives', 0)
+        self.cta_counts.update(advertising.get('cta_distribution', {}))
+        self.theme_counts.update(advertising.get('theme_distribution', {}))
+
+        return self
+
+    def merge(self, other: 'CompetitorAggregate') -> 'CompetitorAggregate':
+        """Fold an aggregate built over a later chunk into this one"""
+        if other.advertising_count and not self.advertising_count:
+            self.first_advertiser = other.first_advertiser
+
+        self.count += other.count
+        self.total_followers += other.total_followers
+        self.total_content_performance += other.total_content_performance
+        self.total_platforms += other.total_platforms
+        self.advertising_count += other.advertising_count
+        self.weak_engagement_count += other.weak_engagement_count
+        self.cross_platform_gap_count += other.cross_platform_gap_count
+
+        for attr in ('follower_leader', 'views_leader', 'competitiveness_leader'):
+            leader = getattr(other, attr)
+            if leader is not None:
+                setattr(self, attr, self._update_leader(getattr(self, attr), *leader))
+
+        self.locations |= other.locations
+        self.categories |= other.categories
+        self.unique_creatives += other.unique_creatives
+        self.duplicate_creatives += other.duplicate_creatives
+        self.cta_counts.update(other.cta_counts)
+        self.theme_counts.update(other.theme_counts)
+        return self
+
+    @property
+    def average_followers(self) -> float:
+        return self.total_followers / self.count if self.count else 0
+
+    @property
+    def average_content_performance(self) -> float:
+        return self.total_content_performance / self.count if self.count else 0
+
+    @property
+    def average_platforms(self) -> float:
+        return self.total_platforms / self.count if self.count else 0
+
+    @property
+    def advertising_gap_count(self) -> int:
+        return self.count - self.advertising_count
+
+    def summary_stats(self) -> dict:
+        """Summary statistics in the shape of FacebookCompetitorAnalyzer.generate_summary_stats"""
+        return {
+            'total_combined_followers': self.total_followers,
+            'average_followers': round(self.average_followers, 2),
+            'average_content_performance': round(self.average_content_performance, 2),
+            'advertising_adoption_rate': round(self.advertising_count / self.count * 100, 2) if self.count else 0,
+            'cross_platform_adoption': round(self.average_platforms, 2)
+        }
+
+    def advertising_market(self) -> dict:
+        """Market-wide CTA and messaging theme distributions over deduplicated creatives"""
+        return {
+            'advertisers': self.advertising_count,
+            'unique_creatives': self.unique_creatives,
+            'duplicate_creatives': self.duplicate_creatives,
+            'cta_distribution': dict(self.cta_counts.most_common()),
+            'theme_distribution': dict(self.theme_counts.most_common())
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form of the aggregate"""
+        state = dict(self.__dict__)
+        state['locations'] = sorted(self.locations)
+        state['categories'] = sorted(self.categories)
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'CompetitorAggregate':
+        """Rebuild an aggregate from to_dict() output"""
+        aggregate = cls()
+        aggregate.__dict__.update(state)
+        aggregate.locations = set(state.get('locations', []))
+        aggregate.categories = set(state.get('categories', []))
+        aggregate.cta_counts = Counter(state.get('cta_counts', {}))
+        aggregate.theme_counts = Counter(state.get('theme_counts', {}))
+        return aggregate
+
+
+class RankIndex:
+    """
+    Mergeable value histogram answering descending competition ranks.
+
+    rank(value) is 1 plus the number of recorded values strictly greater than
+    value, which is what sorted(values, reverse=True).index(value) + 1 returns.
+    The index only stores one count per distinct value, so shards can ship it
+    alongside their CompetitorAggregate and a reducer can rank any page
+    without loading every other page.
+    """
+
+    def __init__(self, values: Iterable = ()):
+        self.counts = Counter(values)
+        self._keys = None
+        self._greater = None
+
+    def add(self, value) -> 'RankIndex':
+        self.counts[value] += 1
+        self._keys = None
+        return self
+
+    def merge(self, other: 'RankIndex') -> 'RankIndex':
+        self.counts.update(other.counts)
+        self._keys = None
+        return self
+
+    def _build(self):
+        self._keys = sorted(self.counts)
+        # _greater[i] is the number of recorded values >= _keys[i]
+        self._greater = [0] * (len(self._keys) + 1)
+        for i in range(len(self._keys) - 1, -1, -1):
+            self._greater[i] = self._greater[i + 1] + self.counts[self._keys[i]]
+
+    def rank(self, value) -> int:
+        """Descending rank of value, with ties sharing the best rank"""
+        if self._keys is None:
+            self._build()
+        return self._greater[bisect_right(self._keys, value)] + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'counts': sorted(self.counts.items())}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'RankIndex':
+        index = cls()
+        index.counts = Counter({value: count for value, count in state['counts']})
+        return index
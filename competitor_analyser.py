@@ -1,20 +1,67 @@
 # competitor_analyser.py
 import json
+import os
 import statistics
 from datetime import datetime
 from typing import Dict, List, Any
 import re
+from competitor_aggregator import CompetitorAggregate, RankIndex
+from page_age import PageAgeEngine
+from compressed_io import load_json
+from analysis_progress import ProgressReporter, DEFAULT_CHUNK_SIZE
+from outlier_detection import RobustOutlierDetector
+from link_classifier import LinkClassifier, PLATFORMS, WEBSITE
+from ad_library import AdLibraryAnalyzer, extract_themes
+from dump_index import PageOffsetIndex, SHARD_INPUT
+
+# Weights of the 0-100 component scores in calculate_competitiveness_score.
+# Growth is off by default so existing scores are unchanged; the what-if engine can sweep it.
+COMPETITIVENESS_WEIGHTS = {'followers': 0.3, 'engagement': 0.3, 'business': 0.2, 'advertising': 0.2, 'growth': 0.0}
+FOLLOWER_SCORE_CAP = 10_000  # followers at which the follower score reaches 100
+GROWTH_SCORE_CAP = 100  # followers gained per day at which the growth score reaches 100
+BUSINESS_MATURITY_SCORES = {'basic': 20, 'developing': 60, 'mature': 100}
+
+# Label sets produced by the analyzer, weakest to strongest
+BUSINESS_MATURITY_LEVELS = tuple(BUSINESS_MATURITY_SCORES)
+ENGAGEMENT_QUALITY_LEVELS = ('insufficient_data', 'very_poor_or_fake_followers', 'poor', 'average', 'good', 'excellent')
+AD_INTENSITY_LEVELS = ('no_advertising', 'light', 'moderate', 'heavy')
+
+# about_info keys that declare a profile on another platform
+ABOUT_INFO_PLATFORMS = {
+    'Instagram': 'instagram', 'TikTok': 'tiktok', 'WhatsApp': 'whatsapp_business', 'YouTube': 'youtube',
+    'X': 'x', 'Pinterest': 'pinterest', 'Threads': 'threads', 'LinkedIn': 'linkedin',
+    'Snapchat': 'snapchat', 'Tumblr': 'tumblr'
+}
 
 class FacebookCompetitorAnalyzer:
-    def __init__(self, data_file_path: str = None, data_dict: dict = None):
-        """Initialize with either file path or data dictionary"""
+    def __init__(self, data_file_path: str = None, data_dict: dict = None, lean_results: bool = False,
+                 outlier_segment=None, shard_dir: str = None):
+        """
+        Initialize with either file path or data dictionary.
+        
+        With lean_results, competitor records keep only derived fields and a
+        page_ref pointing back into the source instead of the raw extraction_data;
+        get_extraction_data() fetches the raw record on demand. shard_dir is
+        the work directory of a sharded run, whose lean records refer to pages
+        of the shard inputs by shard_id.
+        outlier_segment (a function of a competitor record) scores engagement
+        outliers within segments instead of across the whole market.
+        """
+        self.data_file_path = data_file_path
+        self.lean_results = lean_results
+        self.outlier_segment = outlier_segment
+        self.shard_dir = shard_dir
+        self._page_indexes = {}
+        self.link_classifier = LinkClassifier()
+        self.ad_library = AdLibraryAnalyzer()
         if data_dict:
             self.data = data_dict
         elif data_file_path:
-            with open(data_file_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            # Plain, gzip, bz2 or xz dumps, detected from the file contents
+            self.data = load_json(data_file_path)
         else:
             raise ValueError("Either data_file_path or data_dict must be provided")
+        self.market_aggregate = None
         
     # def convert_to_number(self, value: str) -> int:
     #     """Convert string numbers with K suffix to integers"""
@@ -117,15 +164,26 @@ class FacebookCompetitorAnalyzer:
         """Analyze business information and setup"""
         about_info = page_data.get('about_info', {})
         
+        # The page's links (and its declared website) are classified once and feed both
+        # the cross-platform presence and the contact methods
+        links = list(page_data.get('all_links') or [])
+        if about_info.get('Website'):
+            links.append(about_info['Website'])
+        linked_platforms = self.link_classifier.classify(links)
+        cross_platform = self.analyze_cross_platform(about_info, linked_platforms)
+        platforms = cross_platform['platforms']
+        
         contact_methods = []
         if about_info.get('Mobile'):
             contact_methods.append('phone')
-        if about_info.get('WhatsApp'):
+        if platforms['whatsapp_business']:
             contact_methods.append('whatsapp')
-        if about_info.get('TikTok'):
+        if platforms['tiktok']:
             contact_methods.append('tiktok')
-        if about_info.get('Tumblr'):
+        if platforms['tumblr']:
             contact_methods.append('tumblr')
+        if platforms['telegram']:
+            contact_methods.append('telegram')
         
         return {
             'categories': about_info.get('Categories', 'not_specified'),
@@ -133,22 +191,23 @@ class FacebookCompetitorAnalyzer:
             'contact_methods': contact_methods,
             'contact_diversity_score': len(contact_methods),
             'business_hours': about_info.get('Hours', 'not_specified'),
-            'cross_platform_presence': self.analyze_cross_platform(about_info),
+            'cross_platform_presence': cross_platform,
             'business_maturity': self.assess_business_maturity(about_info)
         }
     
-    def analyze_cross_platform(self, about_info: dict) -> dict:
-        """Analyze cross-platform presence"""
-        platforms = {
-            'tiktok': bool(about_info.get('TikTok')),
-            'whatsapp_business': bool(about_info.get('WhatsApp')),
-            'tumblr': bool(about_info.get('Tumblr'))
-        }
+    def analyze_cross_platform(self, about_info: dict, linked_platforms: Dict[str, List[str]] = None) -> dict:
+        """Analyze cross-platform presence from about_info and the page's classified links"""
+        linked_platforms = linked_platforms or {}
+        platforms = {platform: platform in linked_platforms for platform in PLATFORMS}
+        for key, platform in ABOUT_INFO_PLATFORMS.items():
+            if about_info.get(key):
+                platforms[platform] = True
         
         return {
             'platforms': platforms,
             'total_platforms': sum(platforms.values()),
-            'integration_score': sum(platforms.values()) / len(platforms) * 100
+            'integration_score': sum(platforms.values()) / len(platforms) * 100,
+            'websites': linked_platforms.get(WEBSITE, [])
         }
     
     def assess_business_maturity(self, about_info: dict) -> str:
@@ -173,30 +232,18 @@ class FacebookCompetitorAnalyzer:
     
     def analyze_advertising_strategy(self, ads_data: dict) -> dict:
         """Analyze advertising strategy and investment"""
+        ads_data = ads_data or {}
         total_ads = ads_data.get('total_active_ads', 0)
-        active_ads = ads_data.get('active_ads', [])
+        active_ads = ads_data.get('active_ads') or []
         
         ad_analysis = {
             'is_advertising': total_ads > 0,
             'total_active_ads': total_ads,
             'advertising_intensity': self.categorize_ad_intensity(total_ads),
-            'ad_strategies': [],
-            'cta_types': [],
-            'ad_messaging_themes': []
+            'ad_strategies': []
         }
-        
-        for ad in active_ads:
-            # Analyze CTA
-            cta = ad.get('cta', '').lower()
-            if cta and cta not in ad_analysis['cta_types']:
-                ad_analysis['cta_types'].append(cta)
-            
-            # Analyze messaging themes
-            description = ad.get('ad_description', '').lower()
-            themes = self.extract_messaging_themes(description)
-            ad_analysis['ad_messaging_themes'].extend(themes)
-        
-        ad_analysis['ad_messaging_themes'] = list(set(ad_analysis['ad_messaging_themes']))
+        # CTAs and themes are counted over deduplicated creatives
+        ad_analysis.update(self.ad_library.analyze(active_ads))
         
         return ad_analysis
     
@@ -213,53 +260,38 @@ class FacebookCompetitorAnalyzer:
     
     def extract_messaging_themes(self, description: str) -> List[str]:
         """Extract messaging themes from ad descriptions"""
-        themes = []
-        
-        # Price-related keywords
-        price_keywords = ['price', 'cheap', 'affordable', 'discount', 'offer', 'deal']
-        if any(keyword in description for keyword in price_keywords):
-            themes.append('price_focused')
-        
-        # Quality keywords
-        quality_keywords = ['quality', 'premium', 'best', 'top', 'excellent']
-        if any(keyword in description for keyword in quality_keywords):
-            themes.append('quality_focused')
-        
-        # Service keywords
-        service_keywords = ['service', 'support', 'help', 'consultation']
-        if any(keyword in description for keyword in service_keywords):
-            themes.append('service_focused')
-        
-        # Product keywords
-        product_keywords = ['product', 'design', 'modern', 'new']
-        if any(keyword in description for keyword in product_keywords):
-            themes.append('product_focused')
-        
-        return themes
+        return extract_themes(description)
     
-    def calculate_market_position(self, all_competitors: List[dict]) -> dict:
-        """Calculate market position relative to competitors"""
-        followers_list = [comp['engagement_metrics']['followers'] for comp in all_competitors]
-        views_list = [comp['engagement_metrics']['reel_views']['average_views'] for comp in all_competitors]
+    def calculate_market_position(self, all_competitors: List[dict], total_followers: int = None,
+                                  follower_ranks: RankIndex = None, engagement_ranks: RankIndex = None) -> dict:
+        """
+        Calculate market position relative to competitors.
+        
+        The follower total and rank indexes default to the ones of all_competitors;
+        sharded runs pass market-wide values so each shard can be positioned alone.
+        """
+        if total_followers is None:
+            total_followers = sum(comp['engagement_metrics']['followers'] for comp in all_competitors)
+        if follower_ranks is None:
+            follower_ranks = RankIndex(comp['engagement_metrics']['followers'] for comp in all_competitors)
+        if engagement_ranks is None:
+            engagement_ranks = RankIndex(
+                comp['engagement_metrics']['reel_views']['average_views'] for comp in all_competitors
+            )
         
         market_analysis = {}
         
-        for i, competitor in enumerate(all_competitors):
+        for competitor in all_competitors:
             followers = competitor['engagement_metrics']['followers']
             avg_views = competitor['engagement_metrics']['reel_views']['average_views']
             
             # Market share approximation based on followers
-            total_followers = sum(followers_list)
             market_share = (followers / total_followers * 100) if total_followers > 0 else 0
             
-            # Ranking
-            follower_rank = sorted(followers_list, reverse=True).index(followers) + 1
-            engagement_rank = sorted(views_list, reverse=True).index(avg_views) + 1
-            
             market_analysis[competitor['page_name']] = {
                 'estimated_market_share': round(market_share, 2),
-                'follower_rank': follower_rank,
-                'engagement_rank': engagement_rank,
+                'follower_rank': follower_ranks.rank(followers),
+                'engagement_rank': engagement_ranks.rank(avg_views),
                 'overall_competitiveness': self.calculate_competitiveness_score(competitor)
             }
         
@@ -272,75 +304,145 @@ class FacebookCompetitorAnalyzer:
         ads = competitor_data['advertising_analysis']
         
         # Scoring components (0-100 scale)
-        follower_score = min(metrics['followers'] / 1000 * 10, 100)  # Max at 10K followers
+        follower_score = min(metrics['followers'] / FOLLOWER_SCORE_CAP * 100, 100)
         engagement_score = min(metrics['content_performance_score'], 100)
-        business_maturity_scores = {'basic': 20, 'developing': 60, 'mature': 100}
-        business_score = business_maturity_scores.get(business['business_maturity'], 0)
+        business_score = BUSINESS_MATURITY_SCORES.get(business['business_maturity'], 0)
         advertising_score = 100 if ads['is_advertising'] else 0
+        followers_per_day = competitor_data.get('growth_metrics', {}).get('followers_per_day', 0)
+        growth_score = min(followers_per_day / GROWTH_SCORE_CAP * 100, 100)
         
         # Weighted average
         total_score = (
-            follower_score * 0.3 +
-            engagement_score * 0.3 +
-            business_score * 0.2 +
-            advertising_score * 0.2
+            follower_score * COMPETITIVENESS_WEIGHTS['followers'] +
+            engagement_score * COMPETITIVENESS_WEIGHTS['engagement'] +
+            business_score * COMPETITIVENESS_WEIGHTS['business'] +
+            advertising_score * COMPETITIVENESS_WEIGHTS['advertising'] +
+            growth_score * COMPETITIVENESS_WEIGHTS['growth']
         )
         
         return round(total_score, 2)
     
-    def generate_competitive_insights(self, market_position: dict, all_competitors: List[dict]) -> dict:
-        """Generate actionable competitive insights"""
+    @staticmethod
+    def generate_competitive_insights(market_position: dict, all_competitors: List[dict],
+                                      aggregate: CompetitorAggregate = None) -> dict:
+        """Generate actionable competitive insights (also used on report partitions)"""
+        if aggregate is None:
+            aggregate = CompetitorAggregate.from_competitors(all_competitors, market_position)
+        
+        market_leader = aggregate.follower_leader
+        engagement_leader = aggregate.competitiveness_leader
         insights = {
-            'market_leader': max(market_position.items(), key=lambda x: x[1]['estimated_market_share']),
-            'engagement_leader': max(market_position.items(), key=lambda x: x[1]['overall_competitiveness']),
+            'market_leader': (market_leader[0], market_position[market_leader[0]]) if market_leader else None,
+            'engagement_leader': (engagement_leader[0], market_position[engagement_leader[0]]) if engagement_leader else None,
             'advertising_gap': [],
             'content_opportunities': [],
             'market_gaps': []
         }
         
-        # Find advertising gaps
+        # Content performance is compared against the market average from the aggregate
+        avg_performance = aggregate.average_content_performance
+        
         for competitor in all_competitors:
             if not competitor['advertising_analysis']['is_advertising']:
                 insights['advertising_gap'].append(competitor['page_name'])
-        
-        # Content performance analysis
-        avg_performance = statistics.mean([
-            comp['engagement_metrics']['content_performance_score'] for comp in all_competitors
-        ])
-        
-        for competitor in all_competitors:
-            if competitor['engagement_metrics']['content_performance_score'] < avg_performance:
+            
+            score = competitor['engagement_metrics']['content_performance_score']
+            if score < avg_performance:
                 insights['content_opportunities'].append({
                     'competitor': competitor['page_name'],
-                    'performance_gap': round(avg_performance - competitor['engagement_metrics']['content_performance_score'], 2)
+                    'performance_gap': round(avg_performance - score, 2)
                 })
         
         return insights
     
-    def analyze_all_competitors(self) -> dict:
+    def analyze_page(self, page: dict, page_index: int = None) -> dict:
+        """Analyze a single page record from the scrape dump"""
+        extraction_data = page['extraction_data']
+        competitor_data = {
+            'page_name': page['page_name'] if 'page_name' in page else extraction_data['page_name'],
+            'page_url': page['page_url'] if 'page_url' in page else page['source_urls']['base_url']
+        }
+        if self.lean_results:
+            competitor_data['page_ref'] = {'page_index': page_index, 'page_id': extraction_data.get('Page ID')}
+            competitor_data['creation_date'] = extraction_data.get('Creation_date')
+        else:
+            competitor_data['extraction_data'] = extraction_data
+        competitor_data['engagement_metrics'] = self.calculate_engagement_metrics(extraction_data)
+        competitor_data['business_analysis'] = self.analyze_business_info(extraction_data)
+        competitor_data['advertising_analysis'] = self.analyze_advertising_strategy(page.get('ads_data', {}))
+        return competitor_data
+    
+    def release_data(self):
+        """Drop the loaded dump; lean results fetch single records from data_file_path when needed"""
+        if not self.data_file_path:
+            raise ValueError("release_data requires the analyzer to be created from data_file_path")
+        self.data = None
+    
+    def get_extraction_data(self, competitor: dict) -> dict:
+        """
+        Return the raw extraction_data of a competitor record.
+        
+        Lean records are resolved against the loaded dump, or, once the dump is
+        released or for sharded records, read one by one from the source file
+        through a page offset index, without loading the whole dump again.
+        """
+        if 'extraction_data' in competitor:
+            return competitor['extraction_data']
+        page_ref = competitor['page_ref']
+        if 'shard_id' in page_ref:
+            if not self.shard_dir:
+                raise ValueError("Records from sharded runs need shard_dir, the run's work directory")
+            source = os.path.join(self.shard_dir, SHARD_INPUT.format(page_ref['shard_id']))
+        elif self.data is not None:
+            return self.data['pages'][page_ref['page_index']]['extraction_data']
+        else:
+            source = self.data_file_path
+        if source not in self._page_indexes:
+            self._page_indexes[source] = PageOffsetIndex(source)
+        return self._page_indexes[source].page(page_ref['page_index'])['extraction_data']
+    
+    def analyze_pages(self, pages: List[dict], progress: ProgressReporter = None) -> tuple:
+        """
+        Analyze pages, add bulk growth metrics and fold them into a CompetitorAggregate.
+        
+        Progress is reported, and cancellation checked, every DEFAULT_CHUNK_SIZE pages.
+        """
+        progress = progress or ProgressReporter()
+        competitors_analysis = []
+        with progress.stage('analyze_pages', len(pages), 'pages'):
+            for start in range(0, len(pages), DEFAULT_CHUNK_SIZE):
+                chunk = pages[start:start + DEFAULT_CHUNK_SIZE]
+                competitors_analysis.extend(
+                    self.analyze_page(page, page_index) for page_index, page in enumerate(chunk, start)
+                )
+                progress.advance(len(chunk))
+        
+        # Page age and growth velocity are computed for all pages at once
+        PageAgeEngine.for_dump(self.data or {}).annotate(
+            competitors_analysis, [page['extraction_data'] for page in pages]
+        )
+        
+        aggregate = CompetitorAggregate()
+        for competitor_data in competitors_analysis:
+            aggregate.add(competitor_data, self.calculate_competitiveness_score(competitor_data))
+        return competitors_analysis, aggregate
+    
+    def analyze_all_competitors(self, progress: ProgressReporter = None) -> dict:
         """Main analysis function that processes all competitors"""
         pages = self.data.get('pages', [])
-        competitors_analysis = []
         
         # Analyze each competitor
-        for page in pages:
-            # if "page_name" not in page:
-            #     print(page)
-            competitor_data = {
-                'page_name': page['page_name'] if 'page_name' in page else page['extraction_data']['page_name'],
-                'page_url': page['page_url'] if 'page_url' in page else page['source_urls']['base_url'],
-                'extraction_data': page['extraction_data'],
-                'engagement_metrics': self.calculate_engagement_metrics(page['extraction_data']),
-                'business_analysis': self.analyze_business_info(page['extraction_data']),
-                'advertising_analysis': self.analyze_advertising_strategy(page.get('ads_data', {}))
-            }
-            competitors_analysis.append(competitor_data)
+        competitors_analysis, aggregate = self.analyze_pages(pages, progress)
+        self.market_aggregate = aggregate
         
         # Calculate market positions
         market_position = self.calculate_market_position(competitors_analysis)
         
         # Generate insights
-        competitive_insights = self.generate_competitive_insights(market_position, competitors_analysis)
+        competitive_insights = self.generate_competitive_insights(market_position, competitors_analysis, aggregate)
+        
+        # Suspicious follower and engagement patterns need the whole market's distribution
+        outlier_analysis = RobustOutlierDetector().annotate(competitors_analysis, self.outlier_segment)
         
         # Compile final analysis
         final_analysis = {
@@ -352,29 +454,18 @@ class FacebookCompetitorAnalyzer:
             'competitors': competitors_analysis,
             'market_position_analysis': market_position,
             'competitive_insights': competitive_insights,
-            'summary_statistics': self.generate_summary_stats(competitors_analysis)
+            'summary_statistics': self.generate_summary_stats(competitors_analysis, aggregate),
+            'advertising_market': aggregate.advertising_market(),
+            'outlier_analysis': outlier_analysis
         }
         
         return final_analysis
     
-    def generate_summary_stats(self, competitors: List[dict]) -> dict:
+    def generate_summary_stats(self, competitors: List[dict], aggregate: CompetitorAggregate = None) -> dict:
         """Generate summary statistics across all competitors"""
-        followers_list = [comp['engagement_metrics']['followers'] for comp in competitors]
-        views_list = [comp['engagement_metrics']['reel_views']['average_views'] for comp in competitors]
-        
-        return {
-            'total_combined_followers': sum(followers_list),
-            'average_followers': round(statistics.mean(followers_list), 2),
-            'average_content_performance': round(statistics.mean([
-                comp['engagement_metrics']['content_performance_score'] for comp in competitors
-            ]), 2),
-            'advertising_adoption_rate': round(sum([
-                1 for comp in competitors if comp['advertising_analysis']['is_advertising']
-            ]) / len(competitors) * 100, 2),
-            'cross_platform_adoption': round(statistics.mean([
-                comp['business_analysis']['cross_platform_presence']['total_platforms'] for comp in competitors
-            ]), 2)
-        }
+        if aggregate is None:
+            aggregate = CompetitorAggregate.from_competitors(competitors)
+        return aggregate.summary_stats()
 
 # Usage example
 def main():
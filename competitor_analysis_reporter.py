@@ -1,25 +1,314 @@
 # competitor_analysis_reporter.py
 import json
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
 import statistics
 from docx import Document
 from docx.shared import Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.shared import OxmlElement, qn
 import os
+import shutil
+import hashlib
+import re
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from competitor_analyser import (
+    FacebookCompetitorAnalyzer, BUSINESS_MATURITY_LEVELS, ENGAGEMENT_QUALITY_LEVELS, AD_INTENSITY_LEVELS
+)
+from competitor_aggregator import CompetitorAggregate
+from compressed_io import COMPRESSION_SUFFIXES, compression_for_filename, open_text
+from ad_library import format_distribution
+from analysis_progress import ProgressReporter, AnalysisCancelled, POLL_INTERVAL
+
+# Column layout of the flattened competitor frame built by _build_frames
+COMPETITOR_FRAME_COLUMNS = (
+    'page_name', 'page_url', 'followers', 'likes', 'like_to_follower_ratio', 'engagement_quality',
+    'total_reel_views', 'average_views', 'median_views', 'max_views', 'min_views', 'total_reels',
+    'content_performance_score', 'categories', 'location', 'business_maturity', 'contact_methods',
+    'contact_diversity_score', 'has_phone', 'has_whatsapp', 'cross_platform', 'total_platforms',
+    'integration_score', 'is_advertising', 'total_active_ads', 'ad_intensity', 'cta_types',
+    'cta_diversity', 'messaging_themes', 'theme_diversity', 'creation_date', 'page_age_days',
+    'followers_per_day', 'views_per_day', 'is_outlier', 'anomaly_flags', 'websites', 'unique_creatives',
+    'duplicate_creatives', 'cta_distribution', 'theme_distribution'
+)
+MARKET_POSITION_COLUMNS = ('estimated_market_share', 'follower_rank', 'engagement_rank', 'overall_competitiveness')
+# Frame columns stored as categoricals: ordered ones use the analyzer's label sets,
+# the others are dictionary-encoded from the values present
+ORDERED_LABEL_COLUMNS = {
+    'engagement_quality': ENGAGEMENT_QUALITY_LEVELS,
+    'business_maturity': BUSINESS_MATURITY_LEVELS,
+    'ad_intensity': AD_INTENSITY_LEVELS
+}
+LABEL_COLUMNS = (
+    'categories', 'location', 'contact_methods', 'cross_platform', 'cta_types', 'messaging_themes', 'anomaly_flags'
+)
+YES_NO = pd.CategoricalDtype(['No', 'Yes'])
+ABOVE_BELOW = pd.CategoricalDtype(['Below', 'Above'])
+
+# Sheet projections: frame column -> sheet column
+OVERVIEW_COLUMNS = {
+    'page_name': 'Competitor_Name',
+    'page_url': 'Page_URL',
+    'followers': 'Followers',
+    'likes': 'Likes',
+    'like_to_follower_ratio': 'Like_to_Follower_Ratio_%',
+    'engagement_quality': 'Engagement_Quality',
+    'average_views': 'Avg_Reel_Views',
+    'max_views': 'Max_Reel_Views',
+    'content_performance_score': 'Content_Performance_Score_%',
+    'total_reels': 'Total_Reels',
+    'categories': 'Business_Category',
+    'location': 'Location',
+    'business_maturity': 'Business_Maturity',
+    'contact_diversity_score': 'Contact_Methods_Count',
+    'total_platforms': 'Cross_Platform_Count',
+    'is_advertising': 'Is_Advertising',
+    'total_active_ads': 'Total_Active_Ads',
+    'ad_intensity': 'Ad_Intensity',
+    'estimated_market_share': 'Market_Share_%',
+    'follower_rank': 'Follower_Rank',
+    'engagement_rank': 'Engagement_Rank',
+    'overall_competitiveness': 'Competitiveness_Score'
+}
+DETAILED_METRICS_COLUMNS = {
+    'page_name': 'Competitor',
+    'followers': 'Followers',
+    'likes': 'Likes',
+    'like_to_follower_ratio': 'Like_Follower_Ratio_%',
+    'engagement_quality': 'Engagement_Quality',
+    'total_reel_views': 'Total_Reel_Views',
+    'average_views': 'Average_Reel_Views',
+    'median_views': 'Median_Reel_Views',
+    'max_views': 'Max_Reel_Views',
+    'min_views': 'Min_Reel_Views',
+    'total_reels': 'Total_Reels_Count',
+    'content_performance_score': 'Content_Performance_Score_%',
+    'views_per_follower': 'Views_Per_Follower_%',
+    'creation_date': 'Creation_Date',
+    'page_age_days': 'Page_Age_Days',
+    'followers_per_day': 'Followers_Per_Day',
+    'views_per_day': 'Views_Per_Day'
+}
+ENGAGEMENT_COLUMNS = {
+    'page_name': 'Competitor',
+    'engagement_quality': 'Engagement_Quality_Rating',
+    'like_to_follower_ratio': 'Like_to_Follower_Ratio_%',
+    'content_performance_score': 'Content_Performance_Score',
+    'high_performing_reels': 'High_Performing_Reels',
+    'low_performing_reels': 'Low_Performing_Reels',
+    'consistency_score': 'Consistency_Score',
+    'max_views': 'Peak_Performance',
+    'min_views': 'Baseline_Performance',
+    'is_outlier': 'Suspicious_Pattern',
+    'anomaly_flags': 'Anomaly_Flags'
+}
+BUSINESS_COLUMNS = {
+    'page_name': 'Competitor',
+    'categories': 'Business_Category',
+    'location': 'Location',
+    'business_maturity': 'Business_Maturity_Level',
+    'contact_methods': 'Contact_Methods',
+    'contact_diversity_score': 'Contact_Diversity_Score',
+    'cross_platform': 'Cross_Platform_Presence',
+    'total_platforms': 'Total_Platforms',
+    'integration_score': 'Integration_Score_%',
+    'has_physical_address': 'Has_Physical_Address',
+    'has_phone': 'Has_Phone_Contact',
+    'has_whatsapp': 'Has_WhatsApp_Business',
+    'websites': 'Websites'
+}
+ADVERTISING_COLUMNS = {
+    'page_name': 'Competitor',
+    'is_advertising': 'Currently_Advertising',
+    'total_active_ads': 'Total_Active_Ads',
+    'ad_intensity': 'Advertising_Intensity',
+    'cta_types': 'CTA_Types_Used',
+    'messaging_themes': 'Messaging_Themes',
+    'theme_diversity': 'Ad_Strategy_Diversity',
+    'cta_diversity': 'CTA_Diversity',
+    'unique_creatives': 'Unique_Creatives',
+    'duplicate_creatives': 'Duplicate_Creatives',
+    'cta_distribution': 'CTA_Distribution',
+    'theme_distribution': 'Theme_Distribution'
+}
+MARKET_COLUMNS = {
+    'page_name': 'Competitor',
+    'estimated_market_share': 'Estimated_Market_Share_%',
+    'follower_rank': 'Follower_Rank',
+    'engagement_rank': 'Engagement_Rank',
+    'overall_competitiveness': 'Overall_Competitiveness_Score'
+}
+REEL_COLUMNS = {
+    'page_name': 'Competitor',
+    'reel_number': 'Reel_Number',
+    'views': 'Views',
+    'above_average': 'Performance_vs_Average',
+    'performance_score': 'Performance_Score_%'
+}
+# Result fields that change on every run without changing the report content
+VOLATILE_RESULT_FIELDS = (('analysis_metadata', 'analysis_date'),)
+# Bump when report layouts change so cached artifacts from older code are not reused
+REPORT_CACHE_VERSION = 3
+# One manifest per results hash, so concurrent renders of different results never share a file
+REPORT_CACHE_MANIFEST = "{}.manifest.json"
+
+REPORT_EXTENSIONS = {'excel': 'xlsx', 'word': 'docx', 'json': 'json'}
+PARTITION_INDEX = "index.json"
+OTHER_PARTITION = "Other"
+
+
+def _primary_category(comp):
+    """First category of a 'Appliances · Home Goods Store' style category string"""
+    return comp['business_analysis']['categories'].split('·')[0].strip() or 'not_specified'
+
+
+def _location_area(comp):
+    """City-level area of a free-text address: the part before the country, ignoring postcodes"""
+    parts = [part.strip() for part in comp['business_analysis']['location'].split(',')]
+    parts = [part for part in parts if part and not part.replace(' ', '').isdigit()]
+    if not parts:
+        return 'not_specified'
+    return parts[-2] if len(parts) > 1 else parts[-1]
+
+
+# Built-in partition keys for generate_partitioned_reports; any callable taking a competitor also works
+PARTITION_KEYS = {
+    'category': _primary_category,
+    'location': _location_area,
+    'maturity': lambda comp: comp['business_analysis']['business_maturity'],
+    'ad_intensity': lambda comp: comp['advertising_analysis']['advertising_intensity'],
+    'engagement': lambda comp: comp['engagement_metrics']['follower_engagement_quality']
+}
+
+
+def _partition_name(by):
+    return by if isinstance(by, str) else getattr(by, '__name__', 'custom')
+
+
+def _render_partition(partition_results, base_filename, formats, cache_dir):
+    """Worker-process entry point: render one partition's report set"""
+    generator = CompetitorReportGenerator(partition_results, cache_dir=cache_dir)
+    creators = {
+        'excel': generator.create_excel_report,
+        'word': generator.create_word_report,
+        'json': generator.create_json_report
+    }
+    return {kind: creators[kind](f"{base_filename}.{REPORT_EXTENSIONS[kind]}") for kind in formats}
+
 
 class CompetitorReportGenerator:
-    def __init__(self, analysis_results):
-        """Initialize with analysis results from FacebookCompetitorAnalyzer"""
+    def __init__(self, analysis_results, cache_dir=None):
+        """
+        Initialize with analysis results from FacebookCompetitorAnalyzer.
+        
+        When cache_dir is given, reports for results that hash the same as an
+        earlier run are hard-linked from the cache instead of regenerated.
+        """
         self.results = analysis_results
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.output_folder = "output"
+        self.cache_dir = cache_dir
+        self._frames = None
+        self._sheet_frames = None
+        self._results_hash = None
+    
+    def results_hash(self):
+        """Stable SHA-256 of the results, ignoring volatile fields such as analysis_date"""
+        if self._results_hash is None:
+            stable = dict(self.results)
+            for section, field in VOLATILE_RESULT_FIELDS:
+                if isinstance(stable.get(section), dict):
+                    stable[section] = {k: v for k, v in stable[section].items() if k != field}
+            payload = json.dumps(
+                [REPORT_CACHE_VERSION, stable], ensure_ascii=False, separators=(',', ':'), default=str
+            )
+            self._results_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return self._results_hash
+    
+    def _manifest_path(self):
+        return os.path.join(self.cache_dir, REPORT_CACHE_MANIFEST.format(self.results_hash()))
+    
+    def _load_manifest(self):
+        """Load this results hash's manifest mapping report kind -> {path, sha256} of the cached file"""
+        try:
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+    
+    def _save_manifest_entry(self, kind, entry):
+        """Add one cached report to the manifest, keeping entries written since it was read"""
+        manifest = self._load_manifest()
+        manifest[kind] = entry
+        manifest_path = self._manifest_path()
+        tmp_path = f"{manifest_path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    
+    def _link_or_copy(self, source, destination):
+        """Hard-link source to destination, copying when linking is not possible"""
+        if os.path.exists(destination):
+            if os.path.samefile(source, destination):
+                return
+            os.remove(destination)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+    
+    @staticmethod
+    def _file_sha256(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _reuse_cached_report(self, kind, filename):
+        """
+        Place a cached report at filename if these results were rendered before.
+        
+        Cached files are hard-linked out to filename, so the checksum recorded
+        when they were stored is verified first; a cached file modified through
+        such a link is treated as a miss and regenerated.
+        """
+        if not self.cache_dir:
+            return None
+        entry = self._load_manifest().get(kind)
+        cached_path = entry.get('path') if isinstance(entry, dict) else None
+        if (not cached_path or not os.path.exists(cached_path)
+                or self._file_sha256(cached_path) != entry.get('sha256')):
+            # Writing through a hard link would overwrite the cached copy too
+            if os.path.exists(filename) and os.stat(filename).st_nlink > 1:
+                os.remove(filename)
+            return None
+        self._link_or_copy(cached_path, filename)
+        return filename
+    
+    def _store_cached_report(self, kind, filename):
+        """Record a freshly generated report in the cache as a private, read-only copy"""
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        results_hash = self.results_hash()
+        cached_path = os.path.abspath(
+            os.path.join(self.cache_dir, f"{results_hash}_{kind.split('.')[0]}{os.path.splitext(filename)[1]}")
+        )
+        # The output file stays a separate inode, so rewriting it never touches the cache
+        tmp_path = f"{cached_path}.tmp-{os.getpid()}"
+        shutil.copyfile(filename, tmp_path)
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, cached_path)
+        self._save_manifest_entry(kind, {'path': cached_path, 'sha256': self._file_sha256(cached_path)})
 
     def create_excel_report(self, filename=None):
         """Create comprehensive Excel report with multiple sheets"""
         if not filename:
             filename = f"competitor_analysis_{self.timestamp}.xlsx"
+        if self._reuse_cached_report('excel', filename):
+            return filename
             
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
             # Main Overview Sheet
@@ -43,50 +332,151 @@ class CompetitorReportGenerator:
             # Reel Performance Sheet
             self._create_reel_performance_sheet(writer)
             
+        self._store_cached_report('excel', filename)
         # print(f"Excel report created: {filename}")
         return filename
     
-    def _create_overview_sheet(self, writer):
-        """Create main overview sheet"""
-        competitors = self.results['competitors']
-        
-        overview_data = []
-        for comp in competitors:
-            name = comp['page_name']
+    def _build_frames(self):
+        """Flatten competitors once into a wide competitor frame and a long reel frame"""
+        if self._frames is not None:
+            return self._frames
+        
+        rows = []
+        reel_rows = []
+        reel_views = []
+        for row_id, comp in enumerate(self.results['competitors']):
             metrics = comp['engagement_metrics']
+            reels = metrics['reel_views']
             business = comp['business_analysis']
+            platforms = business['cross_platform_presence']
             ads = comp['advertising_analysis']
-            market_pos = self.results['market_position_analysis'].get(name, {})
+            growth = comp.get('growth_metrics', {})
+            anomalies = comp.get('anomaly_flags', {})
             
-            overview_data.append({
-                'Competitor_Name': name,
-                'Page_URL': comp['page_url'],
-                'Followers': metrics['followers'],
-                'Likes': metrics['likes'],
-                'Like_to_Follower_Ratio_%': metrics['like_to_follower_ratio'],
-                'Engagement_Quality': metrics['follower_engagement_quality'],
-                'Avg_Reel_Views': metrics['reel_views']['average_views'],
-                'Max_Reel_Views': metrics['reel_views']['max_views'],
-                'Content_Performance_Score_%': metrics['content_performance_score'],
-                'Total_Reels': metrics['total_reels'],
-                'Business_Category': business['categories'],
-                'Location': business['location'],
-                'Business_Maturity': business['business_maturity'],
-                'Contact_Methods_Count': business['contact_diversity_score'],
-                'Cross_Platform_Count': business['cross_platform_presence']['total_platforms'],
-                'Is_Advertising': ads['is_advertising'],
-                'Total_Active_Ads': ads['total_active_ads'],
-                'Ad_Intensity': ads['advertising_intensity'],
-                'Market_Share_%': market_pos.get('estimated_market_share', 0),
-                'Follower_Rank': market_pos.get('follower_rank', 0),
-                'Engagement_Rank': market_pos.get('engagement_rank', 0),
-                'Competitiveness_Score': market_pos.get('overall_competitiveness', 0)
+            active_platforms = [k for k, v in platforms['platforms'].items() if v]
+            rows.append({
+                'page_name': comp['page_name'],
+                'page_url': comp['page_url'],
+                'followers': metrics['followers'],
+                'likes': metrics['likes'],
+                'like_to_follower_ratio': metrics['like_to_follower_ratio'],
+                'engagement_quality': metrics['follower_engagement_quality'],
+                'total_reel_views': reels['total_views'],
+                'average_views': reels['average_views'],
+                'median_views': reels['median_views'],
+                'max_views': reels['max_views'],
+                'min_views': reels['min_views'],
+                'total_reels': metrics['total_reels'],
+                'content_performance_score': metrics['content_performance_score'],
+                'categories': business['categories'],
+                'location': business['location'],
+                'business_maturity': business['business_maturity'],
+                'contact_methods': ', '.join(business['contact_methods']) or 'None',
+                'contact_diversity_score': business['contact_diversity_score'],
+                'has_phone': 'phone' in business['contact_methods'],
+                'has_whatsapp': 'whatsapp' in business['contact_methods'],
+                'cross_platform': ', '.join(active_platforms) or 'None',
+                'total_platforms': platforms['total_platforms'],
+                'integration_score': platforms['integration_score'],
+                'is_advertising': ads['is_advertising'],
+                'total_active_ads': ads['total_active_ads'],
+                'ad_intensity': ads['advertising_intensity'],
+                'cta_types': ', '.join(ads['cta_types']) or 'None',
+                'cta_diversity': len(ads['cta_types']),
+                'messaging_themes': ', '.join(ads['ad_messaging_themes']) or 'None',
+                'theme_diversity': len(ads['ad_messaging_themes']),
+                'creation_date': growth.get('creation_date'),
+                'page_age_days': growth.get('page_age_days'),
+                'followers_per_day': growth.get('followers_per_day', 0),
+                'views_per_day': growth.get('views_per_day', 0),
+                'is_outlier': anomalies.get('is_outlier', False),
+                'anomaly_flags': ', '.join(anomalies.get('flags', [])) or 'None',
+                'websites': ', '.join(platforms.get('websites', [])) or 'None',
+                'unique_creatives': ads.get('unique_creatives', 0),
+                'duplicate_creatives': ads.get('duplicate_creatives', 0),
+                'cta_distribution': format_distribution(ads.get('cta_distribution', {})) or 'None',
+                'theme_distribution': format_distribution(ads.get('theme_distribution', {})) or 'None'
             })
+            
+            views = reels['views_distribution']
+            reel_rows.extend([row_id] * len(views))
+            reel_views.extend(views)
+        
+        df = pd.DataFrame(rows, columns=list(COMPETITOR_FRAME_COLUMNS))
+        
+        # Market position is keyed by page name, so join it on the name column
+        market = pd.DataFrame.from_dict(
+            self.results['market_position_analysis'], orient='index', columns=list(MARKET_POSITION_COLUMNS)
+        )
+        df = df.join(market, on='page_name')
+        df[list(MARKET_POSITION_COLUMNS)] = df[list(MARKET_POSITION_COLUMNS)].fillna(0)
+        
+        avg = df['average_views']
+        safe_avg = avg.where(avg > 0)
+        df['views_per_follower'] = (avg / df['followers'].where(df['followers'] > 0) * 100).fillna(0)
+        df['consistency_score'] = (df['median_views'] / safe_avg * 100).fillna(0)
+        df['has_physical_address'] = df['location'] != 'not_specified'
+        
+        # One row per reel, pointing back to its competitor row
+        reel_df = pd.DataFrame({
+            'row_id': np.asarray(reel_rows, dtype='int64'),
+            'views': np.asarray(reel_views, dtype='int64')
+        })
+        row_ids = reel_df['row_id'].to_numpy()
+        reel_df['page_name'] = df['page_name'].to_numpy()[row_ids]
+        reel_df['reel_number'] = reel_df.groupby('row_id').cumcount() + 1
+        reel_avg = avg.to_numpy()[row_ids]
+        reel_df['above_average'] = reel_df['views'] > reel_avg
+        reel_df['performance_score'] = (reel_df['views'] / np.where(reel_avg > 0, reel_avg, np.nan) * 100).fillna(0)
+        
+        counts = pd.DataFrame({
+            'row_id': reel_df['row_id'],
+            'high': reel_df['views'] > reel_avg,
+            'low': reel_df['views'] < reel_avg
+        }).groupby('row_id')[['high', 'low']].sum()
+        df['high_performing_reels'] = counts['high'].reindex(df.index, fill_value=0).astype('int64')
+        df['low_performing_reels'] = counts['low'].reindex(df.index, fill_value=0).astype('int64')
+        
+        # Label columns are few distinct strings repeated per row, so dictionary-encode them
+        for column, levels in ORDERED_LABEL_COLUMNS.items():
+            extra = sorted(set(df[column].dropna()) - set(levels))
+            df[column] = pd.Categorical(df[column], categories=[*levels, *extra], ordered=True)
+        for column in LABEL_COLUMNS:
+            df[column] = df[column].astype('category')
+        reel_df['page_name'] = reel_df['page_name'].astype('category')
+        
+        self._frames = (df, reel_df)
+        return self._frames
+    
+    def competitor_frame(self):
+        """Wide DataFrame with one row per competitor, in results order; label columns are categoricals"""
+        return self._build_frames()[0]
+
+    def reel_frame(self):
+        """Long DataFrame with one row per reel, linked to competitor_frame() by row_id"""
+        return self._build_frames()[1]
+
+    def _project(self, frame, columns):
+        """Select and rename frame columns for a sheet"""
+        return frame[list(columns)].rename(columns=columns)
+    
+    def _encode_flags(self, frame, columns, dtype=YES_NO):
+        """Replace boolean columns with a two-level categorical such as No/Yes"""
+        for column in columns:
+            frame[column] = pd.Categorical.from_codes(frame[column].astype('int8'), dtype=dtype)
+        return frame
+    
+    def sheet_frames(self):
+        """
+        The Excel report's tables keyed by sheet name, as written to the workbook.
         
-        df_overview = pd.DataFrame(overview_data)
-        df_overview.to_excel(writer, sheet_name='Overview', index=False)
+        Label and Yes/No columns are categoricals, so grouping and sorting on
+        them work on integer codes rather than strings.
+        """
+        if self._sheet_frames is not None:
+            return self._sheet_frames
         
-        # Add summary statistics
+        df, reel_df = self._build_frames()
         summary_stats = self.results['summary_statistics']
         summary_data = pd.DataFrame([
             ['Total Combined Followers', f"{summary_stats['total_combined_followers']:,}"],
@@ -97,168 +487,68 @@ class CompetitorReportGenerator:
             ['Analysis Date', self.results['analysis_metadata']['analysis_date'][:10]]
         ], columns=['Metric', 'Value'])
         
-        summary_data.to_excel(writer, sheet_name='Summary_Stats', index=False)
+        # Market position holds one entry per page name
+        df_market = self._project(df.drop_duplicates('page_name'), MARKET_COLUMNS)
+        
+        self._sheet_frames = {
+            'Overview': self._project(df, OVERVIEW_COLUMNS),
+            'Summary_Stats': summary_data,
+            'Detailed_Metrics': self._project(df, DETAILED_METRICS_COLUMNS),
+            'Engagement_Analysis': self._encode_flags(
+                self._project(df, ENGAGEMENT_COLUMNS), ('Suspicious_Pattern',)
+            ),
+            'Business_Analysis': self._encode_flags(
+                self._project(df, BUSINESS_COLUMNS),
+                ('Has_Physical_Address', 'Has_Phone_Contact', 'Has_WhatsApp_Business')
+            ),
+            'Advertising_Analysis': self._encode_flags(
+                self._project(df, ADVERTISING_COLUMNS), ('Currently_Advertising',)
+            ),
+            'Market_Position': df_market.sort_values('Overall_Competitiveness_Score', ascending=False),
+            'Reel_Performance': self._encode_flags(
+                self._project(reel_df, REEL_COLUMNS), ('Performance_vs_Average',), ABOVE_BELOW
+            )
+        }
+        return self._sheet_frames
+    
+    def _create_overview_sheet(self, writer):
+        """Create main overview sheet"""
+        sheets = self.sheet_frames()
+        sheets['Overview'].to_excel(writer, sheet_name='Overview', index=False)
+        
+        # Add summary statistics
+        sheets['Summary_Stats'].to_excel(writer, sheet_name='Summary_Stats', index=False)
     
     def _create_detailed_metrics_sheet(self, writer):
         """Create detailed metrics breakdown"""
-        competitors = self.results['competitors']
-        
-        detailed_data = []
-        for comp in competitors:
-            name = comp['page_name']
-            metrics = comp['engagement_metrics']
-            
-            detailed_data.append({
-                'Competitor': name,
-                'Followers': metrics['followers'],
-                'Likes': metrics['likes'],
-                'Like_Follower_Ratio_%': metrics['like_to_follower_ratio'],
-                'Engagement_Quality': metrics['follower_engagement_quality'],
-                'Total_Reel_Views': metrics['reel_views']['total_views'],
-                'Average_Reel_Views': metrics['reel_views']['average_views'],
-                'Median_Reel_Views': metrics['reel_views']['median_views'],
-                'Max_Reel_Views': metrics['reel_views']['max_views'],
-                'Min_Reel_Views': metrics['reel_views']['min_views'],
-                'Total_Reels_Count': metrics['total_reels'],
-                'Content_Performance_Score_%': metrics['content_performance_score'],
-                'Views_Per_Follower_%': (metrics['reel_views']['average_views'] / metrics['followers'] * 100) if metrics['followers'] > 0 else 0
-            })
-        
-        df_detailed = pd.DataFrame(detailed_data)
-        df_detailed.to_excel(writer, sheet_name='Detailed_Metrics', index=False)
+        self.sheet_frames()['Detailed_Metrics'].to_excel(writer, sheet_name='Detailed_Metrics', index=False)
     
     def _create_engagement_sheet(self, writer):
         """Create engagement analysis sheet"""
-        competitors = self.results['competitors']
-        
-        engagement_data = []
-        for comp in competitors:
-            name = comp['page_name']
-            metrics = comp['engagement_metrics']
-            
-            # Calculate engagement ranges
-            views = metrics['reel_views']['views_distribution']
-            if views:
-                high_performing = len([v for v in views if v > metrics['reel_views']['average_views']])
-                low_performing = len([v for v in views if v < metrics['reel_views']['average_views']])
-            else:
-                high_performing = low_performing = 0
-            
-            engagement_data.append({
-                'Competitor': name,
-                'Engagement_Quality_Rating': metrics['follower_engagement_quality'],
-                'Like_to_Follower_Ratio_%': metrics['like_to_follower_ratio'],
-                'Content_Performance_Score': metrics['content_performance_score'],
-                'High_Performing_Reels': high_performing,
-                'Low_Performing_Reels': low_performing,
-                'Consistency_Score': (metrics['reel_views']['median_views'] / metrics['reel_views']['average_views'] * 100) if metrics['reel_views']['average_views'] > 0 else 0,
-                'Peak_Performance': metrics['reel_views']['max_views'],
-                'Baseline_Performance': metrics['reel_views']['min_views']
-            })
-        
-        df_engagement = pd.DataFrame(engagement_data)
-        df_engagement.to_excel(writer, sheet_name='Engagement_Analysis', index=False)
+        self.sheet_frames()['Engagement_Analysis'].to_excel(writer, sheet_name='Engagement_Analysis', index=False)
     
     def _create_business_sheet(self, writer):
         """Create business analysis sheet"""
-        competitors = self.results['competitors']
-        
-        business_data = []
-        for comp in competitors:
-            name = comp['page_name']
-            business = comp['business_analysis']
-            
-            # Parse contact methods
-            contact_methods = ', '.join(business['contact_methods']) if business['contact_methods'] else 'None'
-            platforms = business['cross_platform_presence']['platforms']
-            active_platforms = ', '.join([k for k, v in platforms.items() if v]) if any(platforms.values()) else 'None'
-            
-            business_data.append({
-                'Competitor': name,
-                'Business_Category': business['categories'],
-                'Location': business['location'],
-                'Business_Maturity_Level': business['business_maturity'],
-                'Contact_Methods': contact_methods,
-                'Contact_Diversity_Score': business['contact_diversity_score'],
-                'Cross_Platform_Presence': active_platforms,
-                'Total_Platforms': business['cross_platform_presence']['total_platforms'],
-                'Integration_Score_%': business['cross_platform_presence']['integration_score'],
-                'Has_Physical_Address': 'Yes' if business['location'] != 'not_specified' else 'No',
-                'Has_Phone_Contact': 'Yes' if 'phone' in business['contact_methods'] else 'No',
-                'Has_WhatsApp_Business': 'Yes' if 'whatsapp' in business['contact_methods'] else 'No'
-            })
-        
-        df_business = pd.DataFrame(business_data)
-        df_business.to_excel(writer, sheet_name='Business_Analysis', index=False)
+        self.sheet_frames()['Business_Analysis'].to_excel(writer, sheet_name='Business_Analysis', index=False)
     
     def _create_advertising_sheet(self, writer):
         """Create advertising analysis sheet"""
-        competitors = self.results['competitors']
-        
-        advertising_data = []
-        for comp in competitors:
-            name = comp['page_name']
-            ads = comp['advertising_analysis']
-            
-            # Parse ad details
-            cta_types = ', '.join(ads['cta_types']) if ads['cta_types'] else 'None'
-            messaging_themes = ', '.join(ads['ad_messaging_themes']) if ads['ad_messaging_themes'] else 'None'
-            
-            advertising_data.append({
-                'Competitor': name,
-                'Currently_Advertising': 'Yes' if ads['is_advertising'] else 'No',
-                'Total_Active_Ads': ads['total_active_ads'],
-                'Advertising_Intensity': ads['advertising_intensity'],
-                'CTA_Types_Used': cta_types,
-                'Messaging_Themes': messaging_themes,
-                'Ad_Strategy_Diversity': len(ads['ad_messaging_themes']),
-                'CTA_Diversity': len(ads['cta_types'])
-            })
-        
-        df_advertising = pd.DataFrame(advertising_data)
-        df_advertising.to_excel(writer, sheet_name='Advertising_Analysis', index=False)
+        self.sheet_frames()['Advertising_Analysis'].to_excel(writer, sheet_name='Advertising_Analysis', index=False)
     
     def _create_market_position_sheet(self, writer):
         """Create market position analysis sheet"""
-        market_data = []
-        
-        for competitor, position in self.results['market_position_analysis'].items():
-            market_data.append({
-                'Competitor': competitor,
-                'Estimated_Market_Share_%': position['estimated_market_share'],
-                'Follower_Rank': position['follower_rank'],
-                'Engagement_Rank': position['engagement_rank'],
-                'Overall_Competitiveness_Score': position['overall_competitiveness']
-            })
-        
-        df_market = pd.DataFrame(market_data)
-        df_market = df_market.sort_values('Overall_Competitiveness_Score', ascending=False)
-        df_market.to_excel(writer, sheet_name='Market_Position', index=False)
+        self.sheet_frames()['Market_Position'].to_excel(writer, sheet_name='Market_Position', index=False)
     
     def _create_reel_performance_sheet(self, writer):
         """Create individual reel performance sheet"""
-        reel_data = []
-        
-        for comp in self.results['competitors']:
-            name = comp['page_name']
-            views_dist = comp['engagement_metrics']['reel_views']['views_distribution']
-            
-            for i, views in enumerate(views_dist, 1):
-                reel_data.append({
-                    'Competitor': name,
-                    'Reel_Number': i,
-                    'Views': views,
-                    'Performance_vs_Average': 'Above' if views > comp['engagement_metrics']['reel_views']['average_views'] else 'Below',
-                    'Performance_Score_%': (views / comp['engagement_metrics']['reel_views']['average_views'] * 100) if comp['engagement_metrics']['reel_views']['average_views'] > 0 else 0
-                })
-        
-        df_reels = pd.DataFrame(reel_data)
-        df_reels.to_excel(writer, sheet_name='Reel_Performance', index=False)
+        self.sheet_frames()['Reel_Performance'].to_excel(writer, sheet_name='Reel_Performance', index=False)
     
     def create_word_report(self, filename=None):
         """Create formatted Word document report"""
         if not filename:
             filename = f"competitor_analysis_report_{self.timestamp}.docx"
+        if self._reuse_cached_report('word', filename):
+            return filename
         
         doc = Document()
         
@@ -290,10 +580,14 @@ Key findings:
         market_leader = insights['market_leader']
         engagement_leader = insights['engagement_leader']
         
-        leadership_text = f"""
+        if market_leader and engagement_leader:
+            leadership_text = f"""
 Market Share Leader: {market_leader[0]} with {market_leader[1]['estimated_market_share']}% estimated market share
 Engagement Leader: {engagement_leader[0]} with competitiveness score of {engagement_leader[1]['overall_competitiveness']}
-        """
+            """
+        else:
+            # An empty market has no leaders
+            leadership_text = "No competitors were analyzed."
         doc.add_paragraph(leadership_text)
         
         # Individual Competitor Analysis
@@ -305,6 +599,7 @@ Engagement Leader: {engagement_leader[0]} with competitiveness score of {engagem
             metrics = comp['engagement_metrics']
             business = comp['business_analysis']
             ads = comp['advertising_analysis']
+            growth = comp.get('growth_metrics', {})
             
             # Create competitor profile table
             table = doc.add_table(rows=1, cols=2)
@@ -323,7 +618,9 @@ Engagement Leader: {engagement_leader[0]} with competitiveness score of {engagem
                 ('Contact Methods', len(business['contact_methods'])),
                 ('Cross-Platform Presence', business['cross_platform_presence']['total_platforms']),
                 ('Currently Advertising', 'Yes' if ads['is_advertising'] else 'No'),
-                ('Active Ads Count', ads['total_active_ads'])
+                ('Active Ads Count', ads['total_active_ads']),
+                ('Page Created', growth.get('creation_date') or 'Unknown'),
+                ('Followers Per Day', f"{growth.get('followers_per_day', 0):,.2f}")
             ]
             
             for label, value in data_rows:
@@ -341,11 +638,34 @@ Engagement Leader: {engagement_leader[0]} with competitiveness score of {engagem
             gap_text += ', '.join(gap_list)
             doc.add_paragraph(gap_text)
         
+        ad_market = self.results.get('advertising_market', {})
+        if ad_market.get('unique_creatives'):
+            doc.add_heading('Ad Library', level=2)
+            doc.add_paragraph(
+                f"{ad_market['advertisers']} advertisers run {ad_market['unique_creatives']} distinct creatives "
+                f"({ad_market['duplicate_creatives']} repeated ads not counted)."
+            )
+            if ad_market['cta_distribution']:
+                doc.add_paragraph(f"• Calls to action: {format_distribution(ad_market['cta_distribution'])}")
+            if ad_market['theme_distribution']:
+                doc.add_paragraph(f"• Messaging themes: {format_distribution(ad_market['theme_distribution'])}")
+        
         if insights['content_opportunities']:
             doc.add_heading('Content Performance Gaps', level=2)
             for opp in insights['content_opportunities']:
                 doc.add_paragraph(f"• {opp['competitor']}: {opp['performance_gap']}% below market average")
         
+        outliers = [comp for comp in self.results['competitors'] if comp.get('anomaly_flags', {}).get('is_outlier')]
+        if outliers:
+            doc.add_heading('Suspicious Engagement Patterns', level=2)
+            doc.add_paragraph(
+                f"{len(outliers)} competitors have like ratios, views per follower or reel view spreads "
+                f"far from the market norm (robust z-score beyond ±{self.results.get('outlier_analysis', {}).get('threshold', 3.5)}). "
+                "Treat their audience figures with caution."
+            )
+            for comp in outliers:
+                doc.add_paragraph(f"• {comp['page_name']}: {', '.join(comp['anomaly_flags']['flags'])}")
+        
         # Market Position Summary Table
         doc.add_heading('Market Position Summary', level=1)
         
@@ -368,13 +688,20 @@ Engagement Leader: {engagement_leader[0]} with competitiveness score of {engagem
             row_cells[4].text = str(position['overall_competitiveness'])
         
         doc.save(filename)
+        self._store_cached_report('word', filename)
         # print(f"Word report created: {filename}")
         return filename
     
+    def _cache_kind(self, kind, filename):
+        """Cache kind of a report, distinguishing compressed variants of the same format"""
+        return kind + COMPRESSION_SUFFIXES.get(compression_for_filename(filename), '')
+    
     def create_json_report(self, filename=None):
-        """Create comprehensive JSON report"""
+        """Create comprehensive JSON report; a .gz/.bz2/.xz filename writes it compressed"""
         if not filename:
             filename = f"competitor_analysis_data_{self.timestamp}.json"
+        if self._reuse_cached_report(self._cache_kind('json', filename), filename):
+            return filename
         
         # Add additional calculated fields for better analysis
         enhanced_results = self.results.copy()
@@ -385,59 +712,218 @@ Engagement Leader: {engagement_leader[0]} with competitiveness score of {engagem
         all_performance = [comp['engagement_metrics']['content_performance_score'] for comp in self.results['competitors']]
         
         benchmarks = {
-            'follower_benchmarks': {
-                'min': min(all_followers),
-                'max': max(all_followers),
-                'median': statistics.median(all_followers),
-                'q75': statistics.quantiles(all_followers, n=4)[2] if len(all_followers) > 1 else max(all_followers),
-                'q25': statistics.quantiles(all_followers, n=4)[0] if len(all_followers) > 1 else min(all_followers)
-            },
-            'view_benchmarks': {
-                'min': min(all_views),
-                'max': max(all_views),
-                'median': statistics.median(all_views),
-                'q75': statistics.quantiles(all_views, n=4)[2] if len(all_views) > 1 else max(all_views),
-                'q25': statistics.quantiles(all_views, n=4)[0] if len(all_views) > 1 else min(all_views)
-            },
-            'performance_benchmarks': {
-                'min': min(all_performance),
-                'max': max(all_performance),
-                'median': statistics.median(all_performance),
-                'q75': statistics.quantiles(all_performance, n=4)[2] if len(all_performance) > 1 else max(all_performance),
-                'q25': statistics.quantiles(all_performance, n=4)[0] if len(all_performance) > 1 else min(all_performance)
-            }
+            'follower_benchmarks': self._benchmark(all_followers),
+            'view_benchmarks': self._benchmark(all_views),
+            'performance_benchmarks': self._benchmark(all_performance)
         }
         
         enhanced_results['benchmarks'] = benchmarks
         
         # Add quick insights
+        competitors = self.results['competitors']
+        leader_keys = {
+            'top_performer_by_followers': lambda x: x['engagement_metrics']['followers'],
+            'top_performer_by_engagement': lambda x: x['engagement_metrics']['content_performance_score'],
+            'most_active_advertiser': lambda x: x['advertising_analysis']['total_active_ads'],
+            'most_cross_platform': lambda x: x['business_analysis']['cross_platform_presence']['total_platforms'],
+            'newest_competitor': self._creation_date,
+            'fastest_growing': lambda x: x.get('growth_metrics', {}).get('followers_per_day', 0)
+        }
         quick_insights = {
-            'top_performer_by_followers': max(self.results['competitors'], key=lambda x: x['engagement_metrics']['followers'])['page_name'],
-            'top_performer_by_engagement': max(self.results['competitors'], key=lambda x: x['engagement_metrics']['content_performance_score'])['page_name'],
-            'most_active_advertiser': max(self.results['competitors'], key=lambda x: x['advertising_analysis']['total_active_ads'])['page_name'],
-            'most_cross_platform': max(self.results['competitors'], key=lambda x: x['business_analysis']['cross_platform_presence']['total_platforms'])['page_name'],
-            'newest_competitor': min(self.results['competitors'], key=lambda x: int(x['extraction_data'].get('Creation_date', '0')))['page_name'] if self.results['competitors'] else 'N/A'
+            insight: max(competitors, key=key)['page_name'] if competitors else 'N/A'
+            for insight, key in leader_keys.items()
         }
         
         enhanced_results['quick_insights'] = quick_insights
         
-        with open(filename, 'w', encoding='utf-8') as f:
+        with open_text(filename, 'w') as f:
             json.dump(enhanced_results, f, ensure_ascii=False, indent=2)
+        self._store_cached_report(self._cache_kind('json', filename), filename)
         
         # print(f"JSON report created: {filename}")
         return filename
     
-    def generate_all_reports(self, base_filename=None):
-        """Generate all three report formats"""
+    @staticmethod
+    def _benchmark(values):
+        """Min, max, median and quartiles of a metric; None throughout for an empty market"""
+        if not values:
+            return {'min': None, 'max': None, 'median': None, 'q75': None, 'q25': None}
+        return {
+            'min': min(values),
+            'max': max(values),
+            'median': statistics.median(values),
+            'q75': statistics.quantiles(values, n=4)[2] if len(values) > 1 else max(values),
+            'q25': statistics.quantiles(values, n=4)[0] if len(values) > 1 else min(values)
+        }
+    
+    def create_ndjson_report(self, filename=None):
+        """
+        Write one competitor record per line, with its market position attached.
+        
+        Suited to streaming consumers (see compressed_io.iter_json_lines); a
+        .gz/.bz2/.xz filename writes it compressed.
+        """
+        if not filename:
+            filename = f"competitor_analysis_records_{self.timestamp}.ndjson"
+        if self._reuse_cached_report(self._cache_kind('ndjson', filename), filename):
+            return filename
+        
+        market_position = self.results['market_position_analysis']
+        with open_text(filename, 'w') as f:
+            for comp in self.results['competitors']:
+                record = {**comp, 'market_position': market_position.get(comp['page_name'])}
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._store_cached_report(self._cache_kind('ndjson', filename), filename)
+        return filename
+    
+    def _creation_date(self, comp):
+        """Epoch creation date of a competitor; unknown dates sort as the oldest"""
+        creation_date = comp.get('growth_metrics', {}).get('creation_date')
+        if creation_date:
+            return datetime.fromisoformat(creation_date).replace(tzinfo=timezone.utc).timestamp()
+        if 'extraction_data' in comp:
+            return float(comp['extraction_data'].get('Creation_date') or 0)
+        return float(comp.get('creation_date') or 0)
+    
+    def partition_results(self, by='category', min_partition_size=1):
+        """
+        Split the results into one results dict per partition key value.
+        
+        by is a PARTITION_KEYS name or a callable mapping a competitor record to
+        its key. Partitions smaller than min_partition_size are pooled into
+        'Other'. Market positions stay market-wide; summary statistics and
+        competitive insights are recomputed for each partition.
+        """
+        key_function = PARTITION_KEYS[by] if isinstance(by, str) else by
+        groups = {}
+        for comp in self.results['competitors']:
+            groups.setdefault(str(key_function(comp)), []).append(comp)
+        
+        partitions = {}
+        pooled = []
+        for key, competitors in sorted(groups.items(), key=lambda item: (-len(item[1]), item[0])):
+            if len(competitors) < min_partition_size:
+                pooled.extend(competitors)
+            else:
+                partitions[key] = competitors
+        if pooled:
+            partitions.setdefault(OTHER_PARTITION, []).extend(pooled)
+        
+        market_position = self.results['market_position_analysis']
+        partitioned = {}
+        for key, competitors in partitions.items():
+            positions = {comp['page_name']: market_position.get(comp['page_name']) for comp in competitors}
+            aggregate = CompetitorAggregate.from_competitors(competitors, positions)
+            partitioned[key] = {
+                'analysis_metadata': {
+                    **self.results['analysis_metadata'],
+                    'total_competitors': len(competitors),
+                    'partition': {'by': _partition_name(by), 'key': key}
+                },
+                'competitors': competitors,
+                'market_position_analysis': positions,
+                'competitive_insights': FacebookCompetitorAnalyzer.generate_competitive_insights(
+                    positions, competitors, aggregate
+                ),
+                'summary_statistics': aggregate.summary_stats()
+            }
+        return partitioned
+    
+    def generate_partitioned_reports(self, by='category', output_dir=None, formats=tuple(REPORT_EXTENSIONS),
+                                     min_partition_size=1, max_workers=None, progress=None):
+        """
+        Write one report set per partition, rendered in parallel worker processes.
+        
+        Reports go to output_dir/<nnn>_<key>.<ext> next to an index.json that
+        lists every partition with its size and relative report paths. When the
+        run is cancelled, queued partitions are dropped, running ones finish and
+        the index lists only the completed partitions before AnalysisCancelled
+        is re-raised.
+        """
+        progress = progress or ProgressReporter()
+        if not output_dir:
+            output_dir = os.path.join(self.output_folder, f"competitor_partitions_{self.timestamp}")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        partitions = self.partition_results(by, min_partition_size)
+        base_filenames = {}
+        for number, key in enumerate(partitions, start=1):
+            slug = re.sub(r'\W+', '_', key).strip('_')[:60] or 'partition'
+            base_filenames[key] = os.path.join(output_dir, f"{number:03d}_{slug}")
+        
+        files_created = {}
+        cancelled = None
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_render_partition, results, base_filenames[key], formats, self.cache_dir): key
+                for key, results in partitions.items()
+            }
+            pending = set(futures)
+            try:
+                with progress.stage('partitions', len(futures), 'partitions'):
+                    while pending:
+                        done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            files_created[futures[future]] = future.result()
+                        progress.advance(len(done), message=futures[next(iter(done))] if done else None)
+            except AnalysisCancelled as e:
+                cancelled = e
+                for future in pending:
+                    future.cancel()
+        
+        if cancelled:
+            # Partitions that were already rendering when the run was cancelled still completed
+            for future, key in futures.items():
+                if key not in files_created and not future.cancelled() and future.exception() is None:
+                    files_created[key] = future.result()
+        
+        index = {
+            'partitioned_by': _partition_name(by),
+            'analysis_metadata': self.results['analysis_metadata'],
+            'total_partitions': len(files_created),
+            'complete': cancelled is None,
+            'partitions': [
+                {
+                    'key': key,
+                    'total_competitors': len(results['competitors']),
+                    'total_combined_followers': results['summary_statistics']['total_combined_followers'],
+                    'reports': {kind: os.path.relpath(path, output_dir) for kind, path in files_created[key].items()}
+                }
+                for key, results in partitions.items() if key in files_created
+            ]
+        }
+        index_path = os.path.join(output_dir, PARTITION_INDEX)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        
+        if cancelled:
+            raise cancelled
+        print(f"📂 {len(partitions)} partitioned report sets written to {output_dir} (index: {index_path})")
+        return index_path
+    
+    def generate_all_reports(self, base_filename=None, compression=None, progress=None):
+        """
+        Generate all three report formats; compression ('gzip', 'bz2', 'xz') applies to the JSON report.
+        
+        Cancellation is checked between writers, so reports already written stay complete.
+        """
         if not base_filename:
             base_filename = f"competitor_analysis_{self.timestamp}"
+        progress = progress or ProgressReporter()
         
         files_created = {}
+        writers = [
+            ('excel', self.create_excel_report, f"{base_filename}.xlsx"),
+            ('word', self.create_word_report, f"{base_filename}.docx"),
+            ('json', self.create_json_report, f"{base_filename}.json{COMPRESSION_SUFFIXES.get(compression, '')}")
+        ]
         
         # Create all reports
-        files_created['excel'] = self.create_excel_report(f"{base_filename}.xlsx")
-        files_created['word'] = self.create_word_report(f"{base_filename}.docx")
-        files_created['json'] = self.create_json_report(f"{base_filename}.json")
+        with progress.stage('reports', len(writers), 'reports'):
+            for kind, writer, filename in writers:
+                progress.advance(0, message=f"writing {os.path.basename(filename)}")
+                files_created[kind] = writer(filename)
+                progress.advance(1)
         
         print("\n" + "="*60)
         print("📊 REPORT GENERATION COMPLETE")
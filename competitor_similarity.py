@@ -0,0 +1,130 @@
+# competitor_similarity.py
+import zlib
+from typing import Dict, List, Any, Union
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; fall back to blocked brute-force search
+    cKDTree = None
+
+SEARCH_MEMORY_BUDGET = 256 * 1024 ** 2  # bytes of distance and index scratch per block of the fallback search
+
+MATURITY_LEVELS = {'basic': 0, 'developing': 1, 'mature': 2}
+AD_INTENSITY_LEVELS = {'no_advertising': 0, 'light': 1, 'moderate': 2, 'heavy': 3}
+NUMERIC_FEATURES = ('log_followers', 'like_ratio', 'log_reel_views', 'maturity', 'ad_intensity')
+
+
+def category_tokens(categories: str) -> List[str]:
+    """Split a Facebook category string such as 'Appliances · Home Goods Store' into tokens"""
+    if not categories or categories == 'not_specified':
+        return []
+    return [token.strip().lower() for token in categories.split('·') if token.strip()]
+
+
+class CompetitorSimilarityIndex:
+    """
+    k-nearest-competitor index over page feature vectors.
+
+    Each page becomes a dense vector of standardized numeric features
+    (log followers, like ratio, log average reel views, business maturity and
+    ad intensity) plus its category tokens hashed into a few signed dimensions.
+    Queries use a KD-tree when scipy is installed, which keeps all-pages
+    queries sub-quadratic. Without scipy an exact blocked NumPy search is
+    used; it is quadratic in the number of pages, so query_all over 100k
+    pages takes minutes rather than seconds. Its blocks are sized so each
+    one's scratch arrays fit in memory_budget bytes, unless block_size is given.
+    """
+
+    def __init__(self, analysis_results: dict, category_dims: int = 16, category_weight: float = 1.0,
+                 feature_weights: Dict[str, float] = None, block_size: int = None,
+                 memory_budget: int = SEARCH_MEMORY_BUDGET):
+        competitors = analysis_results['competitors']
+        self.page_names = [comp['page_name'] for comp in competitors]
+        # Each query row needs one float64 distance and one int64 argpartition entry per page
+        self.block_size = block_size or max(1, memory_budget // (16 * max(len(competitors), 1)))
+        self._positions = {}
+        for position, name in enumerate(self.page_names):
+            self._positions.setdefault(name, position)
+
+        numeric = np.array([
+            [
+                np.log1p(comp['engagement_metrics']['followers']),
+                comp['engagement_metrics']['like_to_follower_ratio'],
+                np.log1p(comp['engagement_metrics']['reel_views']['average_views']),
+                MATURITY_LEVELS.get(comp['business_analysis']['business_maturity'], 0),
+                AD_INTENSITY_LEVELS.get(comp['advertising_analysis']['advertising_intensity'], 0)
+            ]
+            for comp in competitors
+        ], dtype=float).reshape(len(competitors), len(NUMERIC_FEATURES))
+
+        std = numeric.std(axis=0) if len(numeric) else np.ones(len(NUMERIC_FEATURES))
+        numeric = (numeric - numeric.mean(axis=0)) / np.where(std > 0, std, 1) if len(numeric) else numeric
+        weights = feature_weights or {}
+        numeric *= np.array([weights.get(name, 1.0) for name in NUMERIC_FEATURES])
+
+        categories = np.zeros((len(competitors), category_dims))
+        for row, comp in enumerate(competitors):
+            for token in category_tokens(comp['business_analysis']['categories']):
+                digest = zlib.crc32(token.encode('utf-8'))
+                categories[row, digest % category_dims] += 1 if digest & 0x80000000 else -1
+        norms = np.linalg.norm(categories, axis=1, keepdims=True)
+        categories = categories / np.where(norms > 0, norms, 1) * category_weight
+
+        self.vectors = np.hstack([numeric, categories])
+        self._tree = cKDTree(self.vectors) if cKDTree is not None and len(self.vectors) else None
+
+    def _position(self, page: Union[int, str]) -> int:
+        if isinstance(page, (int, np.integer)):
+            return int(page)
+        if page not in self._positions:
+            raise KeyError(f"Unknown competitor: {page}")
+        return self._positions[page]
+
+    def _search(self, queries: np.ndarray, positions: np.ndarray, k: int):
+        """k nearest neighbours of each query vector, excluding the query's own page"""
+        k = min(k, len(self.vectors) - 1)
+        if k <= 0:
+            return np.zeros((len(queries), 0), dtype=np.int64), np.zeros((len(queries), 0))
+
+        if self._tree is not None:
+            distances, indices = self._tree.query(queries, k=k + 1)
+        else:
+            squared_norms = (self.vectors ** 2).sum(axis=1)
+            indices = np.empty((len(queries), k + 1), dtype=np.int64)
+            distances = np.empty((len(queries), k + 1))
+            for start in range(0, len(queries), self.block_size):
+                block = queries[start:start + self.block_size]
+                # Squared distances built in place, so the block holds a single n-wide float matrix
+                squared = block @ self.vectors.T
+                squared *= -2
+                squared += squared_norms
+                squared += (block ** 2).sum(axis=1)[:, np.newaxis]
+                nearest = np.argpartition(squared, k, axis=1)[:, :k + 1]
+                nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+                order = np.argsort(nearest_squared, axis=1, kind='stable')
+                indices[start:start + len(block)] = np.take_along_axis(nearest, order, axis=1)
+                distances[start:start + len(block)] = np.sqrt(np.maximum(
+                    np.take_along_axis(nearest_squared, order, axis=1), 0
+                ))
+
+        # Drop each page from its own neighbour list, or the farthest hit if it was not returned
+        is_self = indices == positions[:, np.newaxis]
+        drop = np.where(is_self.any(axis=1), is_self.argmax(axis=1), k)
+        keep = np.ones(indices.shape, dtype=bool)
+        keep[np.arange(len(indices)), drop] = False
+        return indices[keep].reshape(len(indices), k), distances[keep].reshape(len(indices), k)
+
+    def query(self, page: Union[int, str], k: int = 5) -> List[Dict[str, Any]]:
+        """The k competitors most similar to one page, given by position or page name"""
+        position = self._position(page)
+        indices, distances = self._search(self.vectors[position:position + 1], np.array([position]), k)
+        return [
+            {'page_name': self.page_names[index], 'position': int(index), 'distance': round(float(distance), 4)}
+            for index, distance in zip(indices[0], distances[0])
+        ]
+
+    def query_all(self, k: int = 5):
+        """Neighbour positions and distances for every page, as two (n_pages, k) arrays"""
+        return self._search(self.vectors, np.arange(len(self.vectors)), k)
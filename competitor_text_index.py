@@ -0,0 +1,171 @@
+# competitor_text_index.py
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Any, Set
+
+TEXT_FIELDS = ('name', 'category', 'address', 'email', 'ads')
+
+ARABIC_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')  # tashkeel and tatweel
+ARABIC_LETTER_MAP = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ة': 'ه', 'ى': 'ي', 'ؤ': 'و', 'ئ': 'ي',
+    '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4', '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9'
+})
+ARABIC_ARTICLES = ('وال', 'بال', 'كال', 'فال', 'ال', 'لل')
+WORD_PATTERN = re.compile(r'\w+')
+QUERY_PATTERN = re.compile(r'\(|\)|[^\s()]+')
+OPERATORS = ('AND', 'OR', 'NOT')
+
+
+def normalize_token(token: str) -> str:
+    """Case-fold a token and fold Arabic letter variants, diacritics, digits and the definite article"""
+    token = ARABIC_DIACRITICS.sub('', token.casefold()).translate(ARABIC_LETTER_MAP)
+    for article in ARABIC_ARTICLES:
+        if token.startswith(article) and len(token) - len(article) >= 2:
+            return token[len(article):]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized tokens; works for mixed Arabic and Latin text"""
+    if not text or not isinstance(text, str):
+        return []
+    # Diacritics are not word characters, so strip them before splitting words
+    return [normalize_token(word) for word in WORD_PATTERN.findall(ARABIC_DIACRITICS.sub('', text))]
+
+
+class CompetitorTextIndex:
+    """
+    In-process inverted index over page names, categories, addresses, emails and ad copy.
+
+    Queries support AND / OR / NOT (implicit AND between terms), parentheses,
+    prefix terms ending in '*', and field-scoped terms such as address:alexandria
+    (fields: name, category, address, email, ads). Results are page positions
+    in the source dump, which select_pages() turns back into a dump that the
+    analyzer and reporter can run on without rescanning every page.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.pages = data.get('pages', [])
+        self.page_ids = []
+        # term -> positions, for all fields and per field
+        self.postings = defaultdict(set)
+        self.field_postings = {field: defaultdict(set) for field in TEXT_FIELDS}
+
+        for position, page in enumerate(self.pages):
+            extraction_data = page.get('extraction_data', {})
+            about_info = extraction_data.get('about_info', {})
+            self.page_ids.append(extraction_data.get('Page ID') or page.get('source_urls', {}).get('base_url'))
+
+            ad_copy = ' '.join(
+                ad.get('ad_description', '') or '' for ad in page.get('ads_data', {}).get('active_ads', [])
+            )
+            field_texts = {
+                'name': page.get('page_name') or extraction_data.get('page_name'),
+                'category': about_info.get('Categories'),
+                'address': about_info.get('Address'),
+                'email': about_info.get('Email'),
+                'ads': ad_copy
+            }
+            for field, text in field_texts.items():
+                for token in tokenize(text):
+                    self.postings[token].add(position)
+                    self.field_postings[field][token].add(position)
+
+        self.all_positions = set(range(len(self.pages)))
+        self._vocabulary = sorted(self.postings)
+        self._field_vocabulary = {field: sorted(terms) for field, terms in self.field_postings.items()}
+
+    def _term_positions(self, term: str) -> Set[int]:
+        field = None
+        if ':' in term:
+            prefix, rest = term.split(':', 1)
+            if prefix.lower() in self.field_postings:
+                field, term = prefix.lower(), rest
+
+        postings = self.field_postings[field] if field else self.postings
+        vocabulary = self._field_vocabulary[field] if field else self._vocabulary
+
+        if term.endswith('*'):
+            tokens = tokenize(term[:-1])
+            if not tokens:
+                return set(self.all_positions)
+            *exact, prefix = tokens
+            matches = set()
+            start = bisect_left(vocabulary, prefix)
+            for token in vocabulary[start:]:
+                if not token.startswith(prefix):
+                    break
+                matches |= postings[token]
+            for token in exact:
+                matches &= postings.get(token, set())
+            return matches
+
+        tokens = tokenize(term)
+        if not tokens:
+            return set(self.all_positions)
+        matches = set(postings.get(tokens[0], set()))
+        for token in tokens[1:]:
+            matches &= postings.get(token, set())
+        return matches
+
+    def _parse(self, tokens: List[str]) -> Set[int]:
+        def parse_or(position):
+            result, position = parse_and(position)
+            while position < len(tokens) and tokens[position] == 'OR':
+                right, position = parse_and(position + 1)
+                result = result | right
+            return result, position
+
+        def parse_and(position):
+            result, position = parse_not(position)
+            while position < len(tokens) and tokens[position] not in ('OR', ')'):
+                if tokens[position] == 'AND':
+                    position += 1
+                right, position = parse_not(position)
+                result = result & right
+            return result, position
+
+        def parse_not(position):
+            if position < len(tokens) and tokens[position] == 'NOT':
+                operand, position = parse_not(position + 1)
+                return self.all_positions - operand, position
+            return parse_atom(position)
+
+        def parse_atom(position):
+            if position >= len(tokens):
+                raise ValueError("Unexpected end of query")
+            token = tokens[position]
+            if token == '(':
+                result, position = parse_or(position + 1)
+                if position >= len(tokens) or tokens[position] != ')':
+                    raise ValueError("Unbalanced parentheses in query")
+                return result, position + 1
+            if token in OPERATORS or token == ')':
+                raise ValueError(f"Unexpected '{token}' in query")
+            return self._term_positions(token), position + 1
+
+        result, position = parse_or(0)
+        if position != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[position]}' in query")
+        return result
+
+    def query_positions(self, query: str) -> List[int]:
+        """Positions in the source dump of pages matching a boolean query"""
+        tokens = QUERY_PATTERN.findall(query)
+        if not tokens:
+            return []
+        return sorted(self._parse(tokens))
+
+    def query(self, query: str) -> List[Any]:
+        """Page IDs of pages matching a boolean query (page URL when a page has no ID)"""
+        return [self.page_ids[position] for position in self.query_positions(query)]
+
+    def select_pages(self, query_or_positions) -> Dict[str, Any]:
+        """A dump-shaped dict holding only the matching pages, ready for FacebookCompetitorAnalyzer"""
+        positions = self.query_positions(query_or_positions) \
+            if isinstance(query_or_positions, str) else sorted(query_or_positions)
+        pages = [self.pages[position] for position in positions]
+        return {**self.data, 'total_pages': len(pages), 'pages': pages}
@@ -0,0 +1,69 @@
+# compressed_io.py
+import bz2
+import gzip
+import json
+import lzma
+from typing import Any, Iterator, Optional
+
+# Leading bytes of each supported compressed stream
+COMPRESSION_MAGIC = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00'
+}
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'bz2': '.bz2', 'xz': '.xz'}
+_OPENERS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+_MAGIC_LENGTH = max(len(magic) for magic in COMPRESSION_MAGIC.values())
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Compression of a file from its magic bytes ('gzip', 'bz2', 'xz'), None for plain files"""
+    with open(path, 'rb') as f:
+        head = f.read(_MAGIC_LENGTH)
+    for compression, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def compression_for_filename(filename: str) -> Optional[str]:
+    """Compression implied by a .gz/.bz2/.xz suffix, None otherwise"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if filename.endswith(suffix):
+            return compression
+    return None
+
+
+def open_text(path: str, mode: str = 'r'):
+    """
+    Open a UTF-8 text file, decompressing or compressing it on the fly.
+
+    Reads detect the compression from the file's magic bytes, so the file name
+    does not matter; writes compress according to the file name suffix.
+    """
+    compression = detect_compression(path) if 'r' in mode else compression_for_filename(path)
+    if compression is None:
+        return open(path, mode, encoding='utf-8')
+    return _OPENERS[compression](path, f"{mode}t", encoding='utf-8')
+
+
+def open_binary(path: str):
+    """Open a plain or compressed file for binary reading, decompressing on the fly"""
+    compression = detect_compression(path)
+    if compression is None:
+        return open(path, 'rb')
+    return _OPENERS[compression](path, 'rb')
+
+
+def load_json(path: str) -> Any:
+    """Load a plain or compressed JSON file"""
+    with open_text(path) as f:
+        return json.load(f)
+
+
+def iter_json_lines(path: str) -> Iterator[Any]:
+    """Stream the records of a plain or compressed NDJSON file one line at a time"""
+    with open_text(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,122 @@
+# dump_index.py
+import codecs
+import json
+from typing import List, Tuple
+
+from compressed_io import open_binary
+
+SHARD_INPUT = "shard-{:05d}.input.json"
+SCAN_CHUNK_SIZE = 1 << 20  # bytes read per step while indexing
+_WHITESPACE = ' \t\n\r'
+
+
+class _JsonStreamScanner:
+    """Walks a JSON document chunk by chunk, tracking the byte offset of the read position"""
+
+    def __init__(self, f, chunk_size: int = SCAN_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.byte_pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            raise ValueError("Unexpected end of JSON document")
+        chunk = self.f.read(self.chunk_size)
+        self.eof = not chunk
+        # Consumed text is dropped so the buffer stays about one chunk long
+        self.buffer = self.buffer[self.pos:] + self.utf8.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    def _advance(self, end: int):
+        self.byte_pos += len(self.buffer[self.pos:end].encode('utf-8'))
+        self.pos = end
+
+    def peek(self) -> str:
+        """Next non-whitespace character"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self._advance(self.pos + 1)
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self._fill()
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at byte {self.byte_pos}")
+        self._advance(self.pos + 1)
+
+    def value(self) -> Tuple[object, int, int]:
+        """Decode the next value; returns it with its start and end byte offsets"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # A number may continue in the next chunk
+                self._fill()
+                continue
+            start = self.byte_pos
+            self._advance(end)
+            return value, start, self.byte_pos
+
+
+class PageOffsetIndex:
+    """
+    Byte offsets of the records in a dump's 'pages' array.
+
+    The index is built lazily by streaming the dump once; afterwards page()
+    seeks to one record and decodes only that, so a single raw record can be
+    fetched without holding the dump in memory. Compressed dumps work too,
+    though seeking in them decompresses up to the record.
+    """
+
+    def __init__(self, path: str, chunk_size: int = SCAN_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._offsets = None
+
+    def _build(self) -> List[Tuple[int, int]]:
+        offsets = []
+        with open_binary(self.path) as f:
+            scanner = _JsonStreamScanner(f, self.chunk_size)
+            scanner.expect('{')
+            while scanner.peek() != '}':
+                key, _, _ = scanner.value()
+                scanner.expect(':')
+                if key != 'pages':
+                    scanner.value()
+                else:
+                    scanner.expect('[')
+                    while scanner.peek() != ']':
+                        _, start, end = scanner.value()
+                        offsets.append((start, end - start))
+                        if scanner.peek() == ',':
+                            scanner.expect(',')
+                    scanner.expect(']')
+                if scanner.peek() == ',':
+                    scanner.expect(',')
+        return offsets
+
+    def __len__(self) -> int:
+        if self._offsets is None:
+            self._offsets = self._build()
+        return len(self._offsets)
+
+    def page(self, page_index: int) -> dict:
+        """The page record at page_index, read from disk"""
+        if self._offsets is None:
+            self._offsets = self._build()
+        start, length = self._offsets[page_index]
+        with open_binary(self.path) as f:
+            f.seek(start)
+            return json.loads(f.read(length).decode('utf-8'))
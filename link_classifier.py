@@ -0,0 +1,116 @@
+# link_classifier.py
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, parse_qs
+
+# Social and messaging platforms tracked in cross_platform_presence
+PLATFORMS = (
+    'instagram', 'tiktok', 'whatsapp_business', 'youtube', 'x', 'telegram',
+    'pinterest', 'threads', 'linkedin', 'snapchat', 'tumblr'
+)
+# Host (or parent domain) -> platform; unlisted hosts are the page's own websites
+LINK_PLATFORM_HOSTS = {
+    'instagram.com': 'instagram',
+    'instagr.am': 'instagram',
+    'tiktok.com': 'tiktok',
+    'wa.me': 'whatsapp_business',
+    'whatsapp.com': 'whatsapp_business',
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'x.com': 'x',
+    'twitter.com': 'x',
+    't.me': 'telegram',
+    'telegram.me': 'telegram',
+    'pinterest.com': 'pinterest',
+    'pin.it': 'pinterest',
+    'threads.com': 'threads',
+    'threads.net': 'threads',
+    'linkedin.com': 'linkedin',
+    'snapchat.com': 'snapchat',
+    'tumblr.com': 'tumblr',
+    'maps.app.goo.gl': 'maps',
+    'maps.google.com': 'maps',
+    'linktr.ee': 'link_hub'
+}
+# Facebook's own navigation links to these hosts appear unwrapped on every page
+META_HOSTS = (
+    'facebook.com', 'fb.com', 'fb.me', 'meta.com', 'meta.ai', 'messenger.com',
+    'threads.com', 'threads.net', 'instagram.com', 'whatsapp.com', 'oculus.com'
+)
+FACEBOOK_HOSTS = ('facebook.com', 'fb.com', 'fb.me')
+FACEBOOK_REDIRECT_HOSTS = ('l.facebook.com', 'lm.facebook.com')
+WEBSITE = 'website'
+
+
+def _suffix_pattern(hosts: Iterable[str]):
+    """Regex matching a hostname equal to, or a subdomain of, any of the hosts"""
+    alternatives = '|'.join(re.escape(host) for host in sorted(hosts, key=len, reverse=True))
+    return re.compile(rf'(?:^|\.)({alternatives})$')
+
+
+_FACEBOOK_PATTERN = _suffix_pattern(FACEBOOK_HOSTS)
+
+
+class LinkClassifier:
+    """
+    Classifies page links into platforms with a compiled host-suffix table.
+
+    Outbound links on Facebook are wrapped in l.facebook.com redirects and are
+    unwrapped first; unwrapped links to Meta's own hosts are Facebook's
+    navigation chrome and are ignored. Hostname classifications are cached,
+    since the same few hosts repeat across every page of a dump.
+    """
+
+    def __init__(self, platform_hosts: Dict[str, str] = None, ignored_hosts: Iterable[str] = META_HOSTS):
+        self.platform_hosts = platform_hosts or LINK_PLATFORM_HOSTS
+        self._platform_pattern = _suffix_pattern(self.platform_hosts)
+        self._ignored_pattern = _suffix_pattern(ignored_hosts)
+        self._host_cache = {}
+
+    def resolve(self, url: str) -> Optional[str]:
+        """The page's own target of a link, or None for Facebook navigation and malformed links"""
+        if not url or not isinstance(url, str):
+            return None
+        url = url.strip()
+        if '://' not in url:
+            url = f"http://{url}"
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return None
+        host = parts.hostname or ''
+        if host in FACEBOOK_REDIRECT_HOSTS:
+            # Links to other Facebook pages are not a presence elsewhere
+            target = parse_qs(parts.query).get('u', [None])[0]
+            if not target:
+                return None
+            try:
+                target_host = urlsplit(target).hostname or ''
+            except ValueError:
+                return None
+            return target if target_host and not _FACEBOOK_PATTERN.search(target_host) else None
+        return None if self._ignored_pattern.search(host) else url
+
+    def classify_host(self, host: str) -> str:
+        """Platform of a hostname, or 'website' for anything else"""
+        if host not in self._host_cache:
+            match = self._platform_pattern.search(host)
+            self._host_cache[host] = self.platform_hosts[match.group(1)] if match else WEBSITE
+        return self._host_cache[host]
+
+    def classify(self, links: Iterable[str]) -> Dict[str, List[str]]:
+        """Platform -> distinct hosts linked for it; websites are listed by host without 'www.'"""
+        found = {}
+        for link in links:
+            target = self.resolve(link)
+            if target is None:
+                continue
+            try:
+                host = (urlsplit(target).hostname or '').lower()
+            except ValueError:
+                continue
+            if not host:
+                continue
+            platform = self.classify_host(host)
+            found.setdefault(platform, set()).add(host[4:] if host.startswith('www.') else host)
+        return {platform: sorted(hosts) for platform, hosts in found.items()}
@@ -0,0 +1,134 @@
+# outlier_detection.py
+from typing import Callable, Dict, List, Any, Union
+
+import numpy as np
+import pandas as pd
+
+OUTLIER_FEATURES = ('like_ratio', 'views_per_follower', 'view_dispersion')
+MAD_TO_SIGMA = 1.4826  # scales the median absolute deviation to a normal standard deviation
+MEAN_AD_TO_SIGMA = 1.2533  # same for the mean absolute deviation, used when the MAD is zero
+# Smallest scale a z-score is divided by; on the log ratios 3.5 * 0.25 is a 2.4x gap from the median
+MIN_SCALE = 0.25
+MARKET_SEGMENT = '__market__'
+
+
+class RobustOutlierDetector:
+    """
+    Batch anomaly detection on follower and engagement patterns.
+
+    Each page gets robust z-scores, (x - median) / (1.4826 * MAD), for:
+    - like_ratio: log of likes per follower;
+    - views_per_follower: log of average reel views per follower;
+    - view_dispersion: coefficient of variation of the page's reel views.
+
+    Medians and MADs are taken over the whole market, or per segment when
+    segments are given. Segments smaller than min_segment_size fall back to
+    market-wide statistics. A page is an outlier when any |z| exceeds the
+    threshold (3.5 by default, the usual cut-off for modified z-scores).
+    The scale never drops below min_scale, so a market where most pages sit
+    close together does not flag ordinary pages for small deviations.
+    Features that cannot be computed, such as ratios of a page without
+    followers or reels, are NaN and never flagged. Zero likes and zero views
+    are treated as unknown, since many pages only show a follower count.
+    """
+
+    def __init__(self, threshold: float = 3.5, min_segment_size: int = 10, min_scale: float = MIN_SCALE):
+        self.threshold = threshold
+        self.min_segment_size = min_segment_size
+        self.min_scale = min_scale
+
+    def features(self, competitors: List[dict]) -> pd.DataFrame:
+        """Feature frame with one row per competitor, in input order"""
+        followers = np.array([comp['engagement_metrics']['followers'] for comp in competitors], dtype=float)
+        likes = np.array([comp['engagement_metrics']['likes'] for comp in competitors], dtype=float)
+        reel_views = [comp['engagement_metrics']['reel_views']['views_distribution'] for comp in competitors]
+
+        # Per-page reel view mean and standard deviation from one flat array
+        counts = np.array([len(views) for views in reel_views], dtype=np.int64)
+        flat = np.fromiter((view for views in reel_views for view in views), dtype=float, count=int(counts.sum()))
+        page_ids = np.repeat(np.arange(len(competitors)), counts)
+        sums = np.bincount(page_ids, weights=flat, minlength=len(competitors))
+        squares = np.bincount(page_ids, weights=flat ** 2, minlength=len(competitors))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_views = np.where(counts > 0, sums / counts, np.nan)
+            std_views = np.sqrt(np.maximum(np.where(counts > 0, squares / counts, np.nan) - mean_views ** 2, 0))
+            safe_followers = np.where(followers > 0, followers, np.nan)
+            return pd.DataFrame({
+                'like_ratio': np.log(np.where(likes > 0, likes, np.nan) / safe_followers),
+                'views_per_follower': np.log(np.where(mean_views > 0, mean_views, np.nan) / safe_followers),
+                'view_dispersion': np.where(mean_views > 0, std_views / mean_views, np.nan)
+            })
+
+    def scores(self, competitors: List[dict],
+               segments: Union[Callable[[dict], Any], List[Any], None] = None) -> pd.DataFrame:
+        """Robust z-scores of every feature, plus the segment each page was scored in"""
+        features = self.features(competitors)
+        if segments is None:
+            labels = pd.Series(MARKET_SEGMENT, index=features.index)
+        else:
+            values = [segments(comp) for comp in competitors] if callable(segments) else list(segments)
+            labels = pd.Series(values, index=features.index, dtype=object).fillna(MARKET_SEGMENT).astype(str)
+            # Segments too small for stable statistics are scored against the market
+            sizes = labels.map(labels.value_counts())
+            labels = labels.where(sizes >= self.min_segment_size, MARKET_SEGMENT)
+
+        grouped = features.groupby(labels)
+        medians = grouped.transform('median')
+        deviations = (features - medians).abs()
+        mad = deviations.groupby(labels).transform('median')
+        mean_ad = deviations.groupby(labels).transform('mean')
+
+        if segments is not None and (labels == MARKET_SEGMENT).any():
+            # Pooled small segments use the whole market's statistics
+            pooled = labels == MARKET_SEGMENT
+            market_medians = features.median()
+            market_deviations = (features - market_medians).abs()
+            medians.loc[pooled, :] = market_medians.to_numpy()
+            mad.loc[pooled, :] = market_deviations.median().to_numpy()
+            mean_ad.loc[pooled, :] = market_deviations.mean().to_numpy()
+
+        scale = np.maximum(np.where(mad > 0, mad * MAD_TO_SIGMA, mean_ad * MEAN_AD_TO_SIGMA), self.min_scale)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where(scale > 0, (features - medians) / scale, 0.0)
+        z = np.where(features.isna(), np.nan, z)
+
+        scores = pd.DataFrame(z, columns=[f"{feature}_z" for feature in OUTLIER_FEATURES], index=features.index)
+        scores['segment'] = labels
+        return scores
+
+    def annotate(self, competitors: List[dict],
+                 segments: Union[Callable[[dict], Any], List[Any], None] = None) -> Dict[str, Any]:
+        """Attach anomaly_flags to each competitor record and return a market summary"""
+        scores = self.scores(competitors, segments)
+        z = scores[[f"{feature}_z" for feature in OUTLIER_FEATURES]].to_numpy()
+        exceeds = np.abs(np.nan_to_num(z)) > self.threshold
+
+        outliers = []
+        for row, competitor in enumerate(competitors):
+            flags = [
+                f"{feature}_{'high' if z[row, column] > 0 else 'low'}"
+                for column, feature in enumerate(OUTLIER_FEATURES) if exceeds[row, column]
+            ]
+            competitor['anomaly_flags'] = {
+                **{
+                    f"{feature}_z": round(float(z[row, column]), 2) if not np.isnan(z[row, column]) else None
+                    for column, feature in enumerate(OUTLIER_FEATURES)
+                },
+                'flags': flags,
+                'is_outlier': bool(flags)
+            }
+            if flags:
+                outliers.append({'competitor': competitor['page_name'], 'flags': flags})
+
+        return {
+            'method': 'robust_z_median_mad',
+            'threshold': self.threshold,
+            'segmented': segments is not None,
+            'outlier_count': len(outliers),
+            'flag_counts': {
+                f"{feature}_{direction}": int(((z[:, column] > 0 if direction == 'high' else z[:, column] < 0)
+                                               & exceeds[:, column]).sum())
+                for column, feature in enumerate(OUTLIER_FEATURES) for direction in ('high', 'low')
+            },
+            'outliers': outliers
+        }
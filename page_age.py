@@ -0,0 +1,119 @@
+# page_age.py
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+SECONDS_PER_DAY = 86_400
+CREATION_DATE_FORMATS = ('%B %d, %Y', '%b %d, %Y', '%B %Y', '%Y')
+YEARLESS_DATE_FORMATS = ('%B %d', '%b %d')
+
+
+@lru_cache(maxsize=None)
+def parse_creation_date(text: str) -> Optional[float]:
+    """
+    Parse a Facebook 'Creation date' string such as 'November 16, 2024' to UTC epoch seconds.
+
+    Dumps repeat the same date strings many times, so results are cached.
+    Strings without a year return None; see PageAgeEngine for those.
+    """
+    if not text or not isinstance(text, str):
+        return None
+    for date_format in CREATION_DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), date_format).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+class PageAgeEngine:
+    """
+    Bulk page age and growth velocity from creation dates.
+
+    Ages are measured at the reference date, which defaults to the dump's
+    extraction timestamp so repeated analyses of the same dump agree. The
+    'Creation date' string is preferred; the epoch 'Creation_date' is used when
+    the string has no year, and a year-less string ('February 26') is placed in
+    the last year before the reference date as a final fallback.
+    """
+
+    def __init__(self, reference_date: datetime = None):
+        reference_date = reference_date or datetime.now(timezone.utc)
+        if reference_date.tzinfo is None:
+            reference_date = reference_date.replace(tzinfo=timezone.utc)
+        self.reference_date = reference_date
+        self.reference_timestamp = reference_date.timestamp()
+        self._yearless_cache = {}
+
+    @classmethod
+    def for_dump(cls, data: dict) -> 'PageAgeEngine':
+        """Engine referenced to a dump's extraction timestamp"""
+        try:
+            return cls(datetime.fromisoformat(data.get('extraction_timestamp')))
+        except (TypeError, ValueError):
+            return cls()
+
+    def _parse_yearless(self, text: str) -> Optional[float]:
+        if not text or not isinstance(text, str):
+            return None
+        if text not in self._yearless_cache:
+            self._yearless_cache[text] = None
+            year = self.reference_date.year
+            for date_format in YEARLESS_DATE_FORMATS:
+                try:
+                    parsed = datetime.strptime(f"{text.strip()} {year}", f"{date_format} %Y").replace(tzinfo=timezone.utc)
+                except ValueError:
+                    continue
+                if parsed > self.reference_date:
+                    parsed = parsed.replace(year=year - 1)
+                self._yearless_cache[text] = parsed.timestamp()
+                break
+        return self._yearless_cache[text]
+
+    def creation_timestamps(self, extraction_records: List[dict]) -> np.ndarray:
+        """UTC epoch creation time of each raw record, NaN when unknown"""
+        created = np.full(len(extraction_records), np.nan)
+        for i, record in enumerate(extraction_records):
+            parsed = parse_creation_date(record.get('Creation date'))
+            if parsed is None:
+                epoch = record.get('Creation_date')
+                if isinstance(epoch, (int, float)) and epoch > 0:
+                    parsed = epoch
+                else:
+                    parsed = self._parse_yearless(record.get('Creation date'))
+            if parsed is not None:
+                created[i] = parsed
+        return created
+
+    def compute(self, created: np.ndarray, followers: np.ndarray, total_views: np.ndarray) -> dict:
+        """Page age in days and followers/views per day for arrays of pages"""
+        age_days = (self.reference_timestamp - created) / SECONDS_PER_DAY
+        age_days = np.where(age_days >= 0, age_days, np.nan)
+        # Pages younger than a day count as one day old
+        active_days = np.maximum(age_days, 1)
+        known = ~np.isnan(age_days)
+        return {
+            'page_age_days': age_days,
+            'followers_per_day': np.where(known, followers / np.where(known, active_days, 1), 0),
+            'views_per_day': np.where(known, total_views / np.where(known, active_days, 1), 0)
+        }
+
+    def annotate(self, competitors: List[dict], extraction_records: List[dict]) -> List[dict]:
+        """Attach growth_metrics to each competitor record, computed for all pages at once"""
+        created = self.creation_timestamps(extraction_records)
+        metrics = self.compute(
+            created,
+            np.array([comp['engagement_metrics']['followers'] for comp in competitors], dtype=float),
+            np.array([comp['engagement_metrics']['reel_views']['total_views'] for comp in competitors], dtype=float)
+        )
+        for i, competitor in enumerate(competitors):
+            age = metrics['page_age_days'][i]
+            competitor['growth_metrics'] = {
+                'creation_date': datetime.fromtimestamp(created[i], timezone.utc).date().isoformat() if not np.isnan(created[i]) else None,
+                'page_age_days': int(age) if not np.isnan(age) else None,
+                'followers_per_day': round(float(metrics['followers_per_day'][i]), 2),
+                'views_per_day': round(float(metrics['views_per_day'][i]), 2)
+            }
+        return competitors
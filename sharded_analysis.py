@@ -0,0 +1,211 @@
+# sharded_analysis.py
+"""
+Map-reduce competitor analysis through files on a shared disk.
+
+    split   one scrape dump -> N shard inputs
+    map     one shard input -> per-page results + a small partial aggregate
+    reduce  all shard outputs -> final analysis results (ranks, market share, insights)
+
+Each step only reads and writes files in a work directory, so map workers can
+run on any machine that mounts it, with no coordination service. Outputs are
+written to a temporary name and renamed into place, so a file that exists is
+always complete. A shard whose partial file exists has finished mapping, and
+reduce refuses to run until every shard listed by split has.
+
+Lean shard results point at a page of their shard input by shard_id and
+page_index; a FacebookCompetitorAnalyzer created with shard_dir=<work_dir>
+fetches their raw records with get_extraction_data().
+"""
+import argparse
+import glob
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Any
+
+from competitor_analyser import FacebookCompetitorAnalyzer
+from competitor_aggregator import CompetitorAggregate, RankIndex
+from compressed_io import load_json
+from analysis_progress import ProgressReporter, TerminalProgressBar
+from outlier_detection import RobustOutlierDetector
+from dump_index import SHARD_INPUT
+
+SHARD_RESULTS = "shard-{:05d}.results.json"
+SHARD_PARTIAL = "shard-{:05d}.partial.json"
+SHARD_MANIFEST = "shards.json"
+
+
+def _write_json(path: str, data) -> str:
+    """Write JSON atomically so readers never see a partial file"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _shard_id(path: str) -> int:
+    return int(os.path.basename(path).split('.')[0].split('-')[1])
+
+
+def split_dump(input_path: str, work_dir: str, num_shards: int) -> List[str]:
+    """Split a scrape dump into contiguous shard inputs, preserving page order"""
+    data = load_json(input_path)
+    pages = data.get('pages', [])
+    os.makedirs(work_dir, exist_ok=True)
+
+    shard_size = max(1, -(-len(pages) // num_shards))
+    shard_paths = []
+    for shard_id, start in enumerate(range(0, len(pages), shard_size)):
+        shard = {
+            'total_pages': len(pages[start:start + shard_size]),
+            'extraction_timestamp': data.get('extraction_timestamp'),
+            'pages': pages[start:start + shard_size]
+        }
+        shard_paths.append(_write_json(os.path.join(work_dir, SHARD_INPUT.format(shard_id)), shard))
+
+    # Reduce checks finished shards against this count
+    _write_json(os.path.join(work_dir, SHARD_MANIFEST), {'total_shards': len(shard_paths), 'total_pages': len(pages)})
+    return shard_paths
+
+
+def _expected_shard_ids(work_dir: str) -> List[int]:
+    """Shard ids written by split: from the shard manifest, else from the shard inputs present"""
+    manifest_path = os.path.join(work_dir, SHARD_MANIFEST)
+    if os.path.exists(manifest_path):
+        return list(range(load_json(manifest_path)['total_shards']))
+    return sorted(_shard_id(path) for path in glob.glob(os.path.join(work_dir, "shard-*.input.json")))
+
+
+def map_shard(shard_path: str, work_dir: str, shard_id: int = None, lean_results: bool = False,
+              progress: ProgressReporter = None) -> str:
+    """
+    Analyze one shard and write its per-page results and partial aggregate.
+    
+    A cancelled run stops before writing anything, so the work directory only
+    ever holds complete shards.
+    """
+    if shard_id is None:
+        shard_id = _shard_id(shard_path)
+
+    analyzer = FacebookCompetitorAnalyzer(data_file_path=shard_path, lean_results=lean_results)
+    competitors, aggregate = analyzer.analyze_pages(analyzer.data.get('pages', []), progress)
+    follower_ranks = RankIndex()
+    engagement_ranks = RankIndex()
+
+    for competitor_data in competitors:
+        if lean_results:
+            # page_index is local to the shard input
+            competitor_data['page_ref']['shard_id'] = shard_id
+        follower_ranks.add(competitor_data['engagement_metrics']['followers'])
+        engagement_ranks.add(competitor_data['engagement_metrics']['reel_views']['average_views'])
+
+    os.makedirs(work_dir, exist_ok=True)
+    _write_json(os.path.join(work_dir, SHARD_RESULTS.format(shard_id)), competitors)
+
+    # The partial is written last and marks the shard as done
+    partial = {
+        'shard_id': shard_id,
+        'extraction_timestamp': analyzer.data.get('extraction_timestamp'),
+        'aggregate': aggregate.to_dict(),
+        'follower_ranks': follower_ranks.to_dict(),
+        'engagement_ranks': engagement_ranks.to_dict()
+    }
+    return _write_json(os.path.join(work_dir, SHARD_PARTIAL.format(shard_id)), partial)
+
+
+def reduce_shards(work_dir: str, output_path: str = None, outlier_segment=None) -> Dict[str, Any]:
+    """
+    Merge shard partials and finalize ranks, market share, insights and outlier flags.
+    
+    Raises FileNotFoundError listing the unfinished shards when any shard
+    written by split has no partial yet, since market-wide figures over part
+    of the market would be silently wrong.
+    """
+    expected = set(_expected_shard_ids(work_dir))
+    partial_paths = sorted(glob.glob(os.path.join(work_dir, "shard-*.partial.json")), key=_shard_id)
+    if expected:
+        # Leftovers of an earlier split into more shards are not part of this run
+        partial_paths = [path for path in partial_paths if _shard_id(path) in expected]
+    if not partial_paths:
+        raise FileNotFoundError(f"No finished shards found in {work_dir}")
+    unfinished = sorted(expected - {_shard_id(path) for path in partial_paths})
+    if unfinished:
+        raise FileNotFoundError(
+            f"{len(unfinished)} shards in {work_dir} have not finished mapping: {', '.join(map(str, unfinished))}"
+        )
+
+    aggregate = CompetitorAggregate()
+    follower_ranks = RankIndex()
+    engagement_ranks = RankIndex()
+    extraction_timestamp = None
+    for path in partial_paths:
+        partial = load_json(path)
+        aggregate.merge(CompetitorAggregate.from_dict(partial['aggregate']))
+        follower_ranks.merge(RankIndex.from_dict(partial['follower_ranks']))
+        engagement_ranks.merge(RankIndex.from_dict(partial['engagement_ranks']))
+        extraction_timestamp = extraction_timestamp or partial['extraction_timestamp']
+
+    # Position each shard against the market-wide totals and ranks
+    analyzer = FacebookCompetitorAnalyzer(data_dict={'pages': []})
+    competitors = []
+    market_position = {}
+    for path in partial_paths:
+        shard_competitors = load_json(os.path.join(work_dir, SHARD_RESULTS.format(_shard_id(path))))
+        market_position.update(analyzer.calculate_market_position(
+            shard_competitors, aggregate.total_followers, follower_ranks, engagement_ranks
+        ))
+        competitors.extend(shard_competitors)
+
+    results = {
+        'analysis_metadata': {
+            'extraction_timestamp': extraction_timestamp,
+            'total_competitors': aggregate.count,
+            'analysis_date': datetime.now().isoformat()
+        },
+        'competitors': competitors,
+        'market_position_analysis': market_position,
+        'competitive_insights': analyzer.generate_competitive_insights(market_position, competitors, aggregate),
+        'summary_statistics': analyzer.generate_summary_stats(competitors, aggregate),
+        'advertising_market': aggregate.advertising_market(),
+        # Medians are not mergeable, so outliers are scored once over all shards' records
+        'outlier_analysis': RobustOutlierDetector().annotate(competitors, outlier_segment)
+    }
+
+    if output_path:
+        _write_json(output_path, results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded Facebook competitor analysis over a shared directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    split_parser = subparsers.add_parser('split', help="Split a scrape dump into shard inputs")
+    split_parser.add_argument('input_path')
+    split_parser.add_argument('work_dir')
+    split_parser.add_argument('--shards', type=int, required=True)
+
+    map_parser = subparsers.add_parser('map', help="Analyze one shard input")
+    map_parser.add_argument('shard_path')
+    map_parser.add_argument('work_dir')
+    map_parser.add_argument('--lean', action='store_true', help="Keep raw extraction_data out of the shard results")
+
+    reduce_parser = subparsers.add_parser('reduce', help="Merge finished shards into final results")
+    reduce_parser.add_argument('work_dir')
+    reduce_parser.add_argument('output_path')
+
+    args = parser.parse_args()
+    if args.command == 'split':
+        for path in split_dump(args.input_path, args.work_dir, args.shards):
+            print(path)
+    elif args.command == 'map':
+        print(map_shard(args.shard_path, args.work_dir, lean_results=args.lean,
+                        progress=ProgressReporter([TerminalProgressBar()])))
+    else:
+        results = reduce_shards(args.work_dir, args.output_path)
+        print(f"Reduced {results['analysis_metadata']['total_competitors']} competitors into {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()